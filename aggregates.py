@@ -0,0 +1,184 @@
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+from distributions import SUMMARY_QUANTILES, merge_distributions, segment_distributions
+from sketches import HyperLogLog, hash_values, precision_for_error
+
+# Every dimension a dashboard panel groups by
+CUBE_DIMENSIONS = [
+    'Item Type',
+    'Item Fat Content',
+    'Outlet Type',
+    'Outlet Location Type',
+    'Outlet Size',
+    'Outlet Establishment Year',
+]
+
+# Additive accumulators kept per cube cell; means are derived as sum / Count
+SUM_MEASURES = ['Sales', 'Rating', 'Item Visibility']
+CUBE_MEASURES = SUM_MEASURES + ['Count']
+
+
+@dataclass
+class SalesCube:
+    """Pre-aggregated sums and counts over CUBE_DIMENSIONS.
+
+    Distinct counts cannot be rolled up from sums, so the item identifiers seen
+    per Outlet Type and the outlet identifiers are kept as sets alongside. With
+    a `distinct_precision` they are HyperLogLog sketches of that precision
+    instead, which give approximate counts in constant memory.
+
+    Quantiles cannot be rolled up either, so `distributions` keeps a mergeable
+    quantile sketch and histogram per (segment dimension, segment, measure).
+    """
+    cells: pd.DataFrame
+    items_by_outlet_type: dict = field(default_factory=dict)
+    outlet_ids: set = field(default_factory=set)
+    distinct_precision: int = None
+    distributions: dict = field(default_factory=dict)
+
+    @property
+    def row_count(self):
+        return int(self.cells['Count'].sum())
+
+    def total(self, measure='Sales'):
+        return float(self.cells[measure].sum())
+
+    def mean(self, measure='Sales'):
+        return self.total(measure) / self.row_count
+
+    def unique_items_count(self):
+        item_ids = new_distinct(self.distinct_precision)
+        for ids in self.items_by_outlet_type.values():
+            item_ids.update(ids)
+        return len(item_ids)
+
+    def unique_outlets_count(self):
+        return len(self.outlet_ids)
+
+    def kpis(self):
+        return {
+            'total_sales': self.total('Sales'),
+            'average_sales': self.mean('Sales'),
+            'average_rating': self.mean('Rating'),
+            'unique_items': self.unique_items_count(),
+            'unique_outlets': self.unique_outlets_count(),
+        }
+
+    def rollup(self, dims, measures='Sales', how='sum'):
+        """Roll the cube up to `dims`, returning one row per group like groupby().reset_index()."""
+        dims = [dims] if isinstance(dims, str) else list(dims)
+        measures = [measures] if isinstance(measures, str) else list(measures)
+        grouped = self.cells.groupby(dims)[CUBE_MEASURES].sum()
+        result = grouped[measures].copy()
+        if how == 'mean':
+            for measure in measures:
+                if measure != 'Count':
+                    result[measure] = grouped[measure] / grouped['Count']
+        elif how != 'sum':
+            raise ValueError(f"Unsupported roll-up: {how!r}")
+        return result.reset_index()
+
+    def quantiles(self, dimension, measure='Sales'):
+        """One row per `dimension` value with its row count, mean and approximate quantiles of `measure`."""
+        data = self.rollup(dimension, ['Count', measure], how='mean').rename(columns={'Count': 'Rows', measure: 'Mean'})
+        estimates = [self.distributions[(dimension, str(segment), measure)].quantile(list(SUMMARY_QUANTILES.values()))
+                     for segment in data[dimension]]
+        for position, label in enumerate(SUMMARY_QUANTILES):
+            data[label] = [estimate[position] for estimate in estimates]
+        return data
+
+    def histogram(self, dimension, measure='Sales'):
+        """Fixed-bin histogram of `measure` per `dimension` value, with each bin's share of the value's rows."""
+        frames = []
+        for (segment_dimension, segment, segment_measure), distribution in self.distributions.items():
+            if segment_dimension == dimension and segment_measure == measure:
+                histogram = distribution.histogram()
+                histogram.insert(0, dimension, segment)
+                histogram['Share'] = histogram['Rows'] / histogram['Rows'].sum() * 100
+                frames.append(histogram)
+        return pd.concat(frames, ignore_index=True).sort_values([dimension, 'Bin Start'], ignore_index=True)
+
+    def outlet_metrics(self):
+        grouped = self.cells.groupby('Outlet Type')[CUBE_MEASURES].sum()
+        return pd.DataFrame({
+            'Total_Sales': grouped['Sales'],
+            'Number_of_Items': [len(self.items_by_outlet_type.get(outlet_type, ()))
+                                for outlet_type in grouped.index],
+            'Average_Sales': grouped['Sales'] / grouped['Count'],
+            'Average_Rating': grouped['Rating'] / grouped['Count'],
+            'Average_Item_Visibility': grouped['Item Visibility'] / grouped['Count'],
+        }, index=grouped.index).reset_index()
+
+
+def new_distinct(precision=None):
+    """Return an empty exact (set) or approximate (HyperLogLog) distinct counter."""
+    return set() if precision is None else HyperLogLog(precision)
+
+
+def _normalize_cells(cells):
+    # Plain string dimension values keep cubes from different sources mergeable
+    for dim in CUBE_DIMENSIONS:
+        if isinstance(cells[dim].dtype, pd.CategoricalDtype):
+            cells[dim] = cells[dim].astype(object)
+    return cells
+
+
+def build_cube(data_frame, distinct_error=None):
+    """Aggregate the raw rows into a SalesCube in a single groupby pass.
+
+    Distinct counts are exact unless `distinct_error` gives the relative error
+    allowed for approximate (HyperLogLog) counts.
+    """
+    measures = data_frame[SUM_MEASURES].astype('float64')
+    measures['Count'] = 1
+    grouped = measures.groupby([data_frame[dim] for dim in CUBE_DIMENSIONS], observed=True)
+    cells = _normalize_cells(grouped.sum().reset_index())
+    distributions = segment_distributions(data_frame)
+
+    if distinct_error is not None:
+        return _sketched_cube(cells, data_frame, precision_for_error(distinct_error), distributions)
+    item_ids = data_frame.groupby('Outlet Type', observed=True)['Item Identifier'].unique()
+    return SalesCube(
+        cells=cells,
+        items_by_outlet_type={str(outlet_type): set(ids) for outlet_type, ids in item_ids.items()},
+        outlet_ids=set(data_frame['Outlet Identifier'].unique()),
+        distributions=distributions,
+    )
+
+
+def _sketched_cube(cells, data_frame, precision, distributions):
+    outlet_type_codes, outlet_types = pd.factorize(data_frame['Outlet Type'])
+    item_hashes = hash_values(data_frame['Item Identifier'])
+    items_by_outlet_type = {}
+    for code, outlet_type in enumerate(outlet_types):
+        items = items_by_outlet_type[str(outlet_type)] = HyperLogLog(precision)
+        items.add_hashes(item_hashes[outlet_type_codes == code])
+    outlet_ids = HyperLogLog(precision)
+    outlet_ids.add(data_frame['Outlet Identifier'])
+    return SalesCube(cells=cells, items_by_outlet_type=items_by_outlet_type, outlet_ids=outlet_ids,
+                     distinct_precision=precision, distributions=distributions)
+
+
+def merge_cubes(cubes):
+    """Combine partial cubes (chunks, shards, appended batches) into one."""
+    cubes = list(cubes)
+    if not cubes:
+        raise ValueError("merge_cubes() needs at least one cube")
+    cells = pd.concat([cube.cells for cube in cubes], ignore_index=True)
+    cells = cells.groupby(CUBE_DIMENSIONS, as_index=False)[CUBE_MEASURES].sum()
+
+    precision = cubes[0].distinct_precision
+    if any(cube.distinct_precision != precision for cube in cubes):
+        raise ValueError("Cannot merge cubes with different distinct count modes")
+    items_by_outlet_type = {}
+    outlet_ids = new_distinct(precision)
+    distributions = {}
+    for cube in cubes:
+        for outlet_type, ids in cube.items_by_outlet_type.items():
+            items_by_outlet_type.setdefault(outlet_type, new_distinct(precision)).update(ids)
+        outlet_ids.update(cube.outlet_ids)
+        merge_distributions(distributions, cube.distributions)
+    return SalesCube(cells=cells, items_by_outlet_type=items_by_outlet_type, outlet_ids=outlet_ids,
+                     distinct_precision=precision, distributions=distributions)
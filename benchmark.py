@@ -0,0 +1,166 @@
+"""Benchmark every dashboard stage on synthetic Blinkit-shaped data.
+
+    python benchmark.py --rows 10000 100000 1000000 --output bench.json
+    python benchmark.py --rows 100000000 --memory-cap-mb 1024 --skip-figures
+    python benchmark.py --rows 100000 --baseline bench.json
+    python benchmark.py --rows 10000000 --memory-cap-mb 512 --distinct-error 0.01
+
+Each row count runs in a fresh process so peak RSS is measured per size. Load,
+aggregation, every panel, every figure and its JSON serialization are timed
+separately. With --baseline, stages that got slower than the tolerance are
+reported and the exit status is 1; stages under --min-seconds are ignored as noise.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+
+def peak_rss_mb():
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+
+
+def run_benchmark(path, rows, memory_cap_mb=None, skip_figures=False, distinct_error=None):
+    from aggregates import build_cube
+    from data_loader import read_dataset
+    from panels import dashboard_tabs
+    from streaming import stream_cube
+
+    stages = {}
+
+    def timed(name, func, *args, throughput=False, **kwargs):
+        started = time.perf_counter()
+        result = func(*args, **kwargs)
+        seconds = time.perf_counter() - started
+        stages[name] = {'seconds': seconds, 'peak_rss_mb': peak_rss_mb()}
+        if throughput:
+            stages[name]['rows_per_second'] = rows / seconds if seconds else None
+        return result
+
+    if memory_cap_mb:
+        cube = timed('stream_aggregate', stream_cube, path, memory_cap_mb=memory_cap_mb,
+                     distinct_error=distinct_error, throughput=True)
+    else:
+        data_frame, _ = timed('load', read_dataset, path, throughput=True)
+        cube = timed('aggregate', build_cube, data_frame, distinct_error, throughput=True)
+        del data_frame
+
+    dashboard = {}
+    for tab, panels, options in dashboard_tabs():
+        dashboard[tab] = {panel: timed(f'panel.{tab}.{panel}', compute, cube, **options)
+                          for panel, compute in panels.items()}
+
+    if not skip_figures:
+        from charts import dashboard_figure_specs
+        for name, builder, args in dashboard_figure_specs(dashboard):
+            figure = timed(f'figure.{name}', builder, *args)
+            payload = timed(f'serialize.{name}', figure.to_json)
+            stages[f'serialize.{name}']['bytes'] = len(payload)
+
+    total_seconds = sum(stage['seconds'] for stage in stages.values())
+    mode = 'streaming' if memory_cap_mb else 'in_memory'
+    return {
+        'rows': rows,
+        'mode': f'{mode}_sketch' if distinct_error else mode,
+        'total_seconds': total_seconds,
+        'rows_per_second': rows / total_seconds if total_seconds else None,
+        'peak_rss_mb': peak_rss_mb(),
+        'stages': stages,
+    }
+
+
+def dataset_path(data_dir, rows, seed):
+    return os.path.join(data_dir, f'synthetic_{rows}_{seed}.csv')
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def find_regressions(results, baseline, tolerance, min_seconds):
+    previous = {(run['rows'], run['mode']): run['stages'] for run in baseline['results']}
+    regressions = []
+    for run in results:
+        for name, stage in run['stages'].items():
+            before = previous.get((run['rows'], run['mode']), {}).get(name)
+            if (before and max(before['seconds'], stage['seconds']) >= min_seconds
+                    and stage['seconds'] > before['seconds'] * (1 + tolerance)):
+                regressions.append((run['rows'], name, before['seconds'], stage['seconds']))
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Blinkit dashboard on synthetic data.")
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--output', '-o', default='benchmark_results.json')
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'blinkit_benchmark'),
+                        help="where generated datasets are cached (default: %(default)s)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--memory-cap-mb', type=float, help="use the streaming engine with this memory cap")
+    parser.add_argument('--skip-figures', action='store_true', help="skip figure construction and serialization")
+    parser.add_argument('--distinct-error', type=float, help="use approximate distinct counts with this relative error")
+    parser.add_argument('--baseline', help="previous results JSON to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="allowed slowdown against the baseline (default: %(default)s)")
+    parser.add_argument('--min-seconds', type=float, default=0.01,
+                        help="ignore stages faster than this when comparing (default: %(default)s)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    from synthetic import write_dataset
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    results = []
+    for rows in args.rows:
+        path = dataset_path(args.data_dir, rows, args.seed)
+        if not os.path.exists(path):
+            print(f"Generating {rows:,} rows -> {path}", file=sys.stderr)
+            write_dataset(path + '.tmp', rows, seed=args.seed)
+            os.replace(path + '.tmp', path)
+
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+            run = executor.submit(run_benchmark, path, rows, args.memory_cap_mb, args.skip_figures,
+                                  args.distinct_error).result()
+        results.append(run)
+        print(f"{rows:>12,} rows  {run['total_seconds']:8.3f}s  {run['rows_per_second']:>14,.0f} rows/s  "
+              f"peak RSS {run['peak_rss_mb']:,.0f} MB", file=sys.stderr)
+
+    report = {
+        'created': datetime.now(timezone.utc).isoformat(),
+        'git_revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    with open(args.output, 'w') as output_file:
+        json.dump(report, output_file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            regressions = find_regressions(results, json.load(baseline_file), args.tolerance,
+                                           args.min_seconds)
+        for rows, name, before, after in regressions:
+            print(f"REGRESSION {rows:,} rows {name}: {before:.4f}s -> {after:.4f}s", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
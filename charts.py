@@ -0,0 +1,150 @@
+"""Plotly figure builders for the Analysis panels."""
+import plotly.express as px
+
+from distributions import DISTRIBUTION_MEASURES
+from panels import FAT_METRICS, distribution_tab_key, fat_tab_key
+
+# Yellow and Green
+FAT_COLOR_PALETTE = ['#CDA900', '#568949']
+OUTLET_COLOR_PALETTE = ['#FFD700', '#FFFFE0', '#568949']
+
+
+# Overview tab
+def item_type_pie(data):
+    return px.pie(data, values='Sales', names='Item Type',
+                  title='Sales Distribution by Item Type',
+                  color_discrete_sequence=px.colors.sequential.RdBu)
+
+
+def outlet_type_donut(data):
+    return px.pie(data, values='Sales', names='Outlet Type',
+                  title="Total Sales by Outlet Type",
+                  color_discrete_sequence=px.colors.sequential.RdBu, hole=0.7)
+
+
+def location_type_bar(data):
+    return px.bar(data, x='Sales', y='Outlet Location Type', orientation='h',
+                  title="Sales by Outlet Location Type", color='Sales',
+                  color_continuous_scale='greens')
+
+
+def item_visibility_bar(data):
+    return px.bar(data,
+                  x='Item Visibility',
+                  y='Item Type',
+                  orientation='h',
+                  title="Average Item Visibility by Item Type",
+                  color='Item Visibility',
+                  color_continuous_scale='ylgn')  # Using a color scale
+
+
+# Fat Based tab
+def fat_content_donut(data, metric_label):
+    return px.pie(data, values='Sales', names='Item Fat Content',
+                  title=f"{metric_label} Distribution by Item Fat Content",
+                  color_discrete_sequence=FAT_COLOR_PALETTE, hole=0.7)
+
+
+def location_fat_bar(data, metric_label):
+    return px.bar(data, x='Sales', y='Outlet Location Type',
+                  color='Item Fat Content', barmode='group', orientation='h',
+                  title=f"{metric_label} by Outlet Location Type and Fat Content",
+                  color_discrete_sequence=FAT_COLOR_PALETTE)
+
+
+def item_type_metric_bar(data, metric_label):
+    return px.bar(data, x='Sales', y='Item Type', orientation='h',
+                  title=f"{metric_label} by Item Type", color='Sales', color_continuous_scale='ylgn',
+                  height=600)
+
+
+# Outlet Based tab
+def sales_by_year_line(data):
+    # Creating a smooth line chart with filled area
+    figure = px.line(data,
+                     x='Outlet Establishment Year',
+                     y='Sales',
+                     title='Sales by Outlet Establishment Year',
+                     line_shape='spline',  # Makes the line smooth
+                     markers=True)         # Adds markers for each data point
+
+    # Update the trace to have white line and markers with darker yellow filled area
+    figure.update_traces(
+        line=dict(color='white'),         # Line color white
+        marker=dict(color='white'),       # Marker color white
+        fill='tozeroy',                   # Fills the area from the line to the x-axis
+        fillcolor='rgba(255, 204, 0, 0.8)'  # Darker yellow with less transparency
+    )
+    return figure
+
+
+def outlet_location_bar(data):
+    return px.bar(data,
+                  x='Outlet Location Type',
+                  y='Sales',
+                  title="Sales by Outlet Location Type",
+                  color='Outlet Location Type',
+                  color_discrete_sequence=OUTLET_COLOR_PALETTE)
+
+
+def outlet_size_donut(data):
+    return px.pie(data,
+                  values='Sales',
+                  names='Outlet Size',
+                  title="Sales by Outlet Size",
+                  hole=0.7,
+                  color_discrete_sequence=OUTLET_COLOR_PALETTE)
+
+
+# Distributions tab
+def distribution_histogram(data, dimension, measure):
+    # Each segment's share of rows per fixed bin, drawn as steps from the bin start
+    return px.line(data, x='Bin Start', y='Share', color=dimension, line_shape='hv',
+                   title=f"{measure} Distribution by {dimension}",
+                   labels={'Bin Start': measure, 'Share': '% of Rows'})
+
+
+# Chart builder for each panel that has a chart
+OVERVIEW_FIGURES = {
+    'item_type_sales': item_type_pie,
+    'outlet_type_sales': outlet_type_donut,
+    'location_type_sales': location_type_bar,
+    'item_visibility': item_visibility_bar,
+}
+
+FAT_FIGURES = {
+    'fat_content_sales': fat_content_donut,
+    'location_fat_sales': location_fat_bar,
+    'item_type_metric_sales': item_type_metric_bar,
+}
+
+OUTLET_FIGURES = {
+    'sales_by_year': sales_by_year_line,
+    'outlet_location_sales': outlet_location_bar,
+    'outlet_size_sales': outlet_size_donut,
+}
+
+DISTRIBUTION_FIGURES = {
+    'item_type_distribution': distribution_histogram,
+    'outlet_type_distribution': distribution_histogram,
+    'outlet_size_distribution': distribution_histogram,
+}
+
+
+def dashboard_figure_specs(dashboard):
+    """List (name, builder, args) for every chart of engine.compute_dashboard() output."""
+    specs = []
+    for panel, builder in OVERVIEW_FIGURES.items():
+        specs.append((f'overview.{panel}', builder, (dashboard['overview'][panel]['data'],)))
+    for metric_label in FAT_METRICS:
+        tab = fat_tab_key(metric_label)
+        for panel, builder in FAT_FIGURES.items():
+            specs.append((f'{tab}.{panel}', builder, (dashboard[tab][panel]['data'], metric_label)))
+    for panel, builder in OUTLET_FIGURES.items():
+        specs.append((f'outlet.{panel}', builder, (dashboard['outlet'][panel]['data'],)))
+    for measure in DISTRIBUTION_MEASURES:
+        tab = distribution_tab_key(measure)
+        for panel, builder in DISTRIBUTION_FIGURES.items():
+            result = dashboard[tab][panel]
+            specs.append((f'{tab}.{panel}', builder, (result['histogram'], result['dimension'], measure)))
+    return specs
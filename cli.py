@@ -0,0 +1,71 @@
+"""Batch command line for the dashboard numbers, without Streamlit or Plotly.
+
+    python cli.py --output results/
+    python cli.py --memory-cap-mb 512 --format parquet --output results/
+    python cli.py --shard-dir shards/ --workers 8 --output results/
+
+Heavy imports are deferred until the arguments are parsed, and the time spent
+importing, loading, computing and writing is saved to timings.json.
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compute every Blinkit dashboard result headlessly.")
+    parser.add_argument('dataset', nargs='?', default='Blinkit_cleaned_dataset.csv',
+                        help="cleaned sales CSV (default: %(default)s)")
+    parser.add_argument('--output', '-o', default='results', help="output directory (default: %(default)s)")
+    parser.add_argument('--format', choices=['json', 'parquet'], default='json')
+    parser.add_argument('--memory-cap-mb', type=float,
+                        help="aggregate the CSV in chunks that fit this memory cap")
+    parser.add_argument('--shard-dir', help="aggregate every CSV shard under this directory instead")
+    parser.add_argument('--workers', type=int, help="worker processes for --shard-dir (default: one per CPU)")
+    parser.add_argument('--distinct-error', type=float,
+                        help="approximate distinct item/outlet counts within this relative error (default: exact)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    started = time.perf_counter()
+
+    from engine import WRITERS, compute_dashboard, load_cube
+    imported = time.perf_counter()
+
+    cube = load_cube(args.dataset, memory_cap_mb=args.memory_cap_mb,
+                     shard_dir=args.shard_dir, workers=args.workers, distinct_error=args.distinct_error)
+    loaded = time.perf_counter()
+
+    dashboard = compute_dashboard(cube)
+    computed = time.perf_counter()
+
+    output_dir = Path(args.output)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    written = WRITERS[args.format](dashboard, output_dir)
+    finished = time.perf_counter()
+
+    timings = {
+        'import_seconds': imported - started,
+        'load_seconds': loaded - imported,
+        'compute_seconds': computed - loaded,
+        'write_seconds': finished - computed,
+        'total_seconds': finished - started,
+        'rows': cube.row_count,
+    }
+    (output_dir / 'timings.json').write_text(json.dumps(timings, indent=2))
+
+    for path in written:
+        print(path, file=sys.stderr)
+    print(f"{cube.row_count:,} rows in {timings['total_seconds']:.3f}s "
+          f"(import {timings['import_seconds']:.3f}s, load {timings['load_seconds']:.3f}s, "
+          f"compute {timings['compute_seconds']:.3f}s, write {timings['write_seconds']:.3f}s)",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""Convert the raw Excel export into a cleaned, columnar Parquet cache.
+
+    python columnar.py BlinkIT_Grocery_Data.xlsx
+
+Parsing a workbook is slow, so it is done once per workbook content: the cache
+file is named after the workbook's path and a hash of its bytes, and a workbook
+whose hash already has a cache file is not parsed again. Cleaning works on the distinct
+values of each text column rather than on every row.
+"""
+import argparse
+import glob
+import hashlib
+import importlib.util
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_loader import CATEGORICAL_COLUMNS, NUMERIC_DTYPES
+
+RAW_WORKBOOK_PATH = "BlinkIT_Grocery_Data.xlsx"
+CACHE_DIR = ".blinkit_cache"
+
+# python-calamine parses workbooks many times faster than openpyxl when installed
+EXCEL_ENGINE = 'calamine' if importlib.util.find_spec('python_calamine') else 'openpyxl'
+
+# Lower-cased spellings found in the raw exports -> canonical fat content
+FAT_CONTENT_SPELLINGS = {
+    'lf': 'Low Fat',
+    'low fat': 'Low Fat',
+    'reg': 'Regular',
+    'regular': 'Regular',
+}
+
+HASH_BLOCK_BYTES = 1024 ** 2
+
+
+def content_hash(path):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as source:
+        for block in iter(lambda: source.read(HASH_BLOCK_BYTES), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_prefix(path, cache_dir=CACHE_DIR):
+    """Return the prefix shared by every cache of the workbook at `path`."""
+    source = hashlib.blake2b(os.path.abspath(path).encode(), digest_size=8).hexdigest()
+    return os.path.join(cache_dir, f'sales-{source}-')
+
+
+def cache_path(path, digest, cache_dir=CACHE_DIR):
+    return f'{cache_prefix(path, cache_dir)}{digest}.parquet'
+
+
+def _clean_categories(values, clean):
+    # Clean each distinct value once, then recode the rows; values that clean to
+    # the same text (e.g. 'LF' and 'Low Fat') merge into one category
+    values = values.astype('category')
+    cleaned_codes, cleaned = pd.factorize(clean(values.cat.categories), sort=True)
+    codes = values.cat.codes.to_numpy()
+    return pd.Categorical.from_codes(np.where(codes < 0, -1, cleaned_codes[codes]), categories=cleaned)
+
+
+def _canonical_fat_content(categories):
+    return categories.map(lambda value: FAT_CONTENT_SPELLINGS.get(value.lower(), value))
+
+
+def clean_sales(data_frame):
+    """Strip text, normalize fat content spellings and apply the dataset dtypes."""
+    cleaned = pd.DataFrame(index=data_frame.index)
+    for column in data_frame.columns:
+        if column == 'Item Fat Content':
+            cleaned[column] = _clean_categories(
+                data_frame[column], lambda categories: _canonical_fat_content(categories.str.strip()))
+        elif column in CATEGORICAL_COLUMNS:
+            cleaned[column] = _clean_categories(data_frame[column], lambda categories: categories.str.strip())
+        elif column in NUMERIC_DTYPES:
+            cleaned[column] = data_frame[column].astype(NUMERIC_DTYPES[column])
+        else:
+            cleaned[column] = data_frame[column]
+    return cleaned
+
+
+def convert_workbook(path, output_path):
+    """Parse, clean and write `path` to `output_path` atomically; return the row count."""
+    data_frame = clean_sales(pd.read_excel(path, engine=EXCEL_ENGINE))
+    temporary_path = f'{output_path}.{os.getpid()}.tmp'
+    data_frame.to_parquet(temporary_path, index=False)
+    os.replace(temporary_path, output_path)
+    return len(data_frame)
+
+
+def ensure_columnar_cache(path=RAW_WORKBOOK_PATH, cache_dir=CACHE_DIR):
+    """Return the Parquet cache for the workbook, converting it only if its content is new."""
+    output_path = cache_path(path, content_hash(path), cache_dir)
+    if not os.path.exists(output_path):
+        os.makedirs(cache_dir, exist_ok=True)
+        convert_workbook(path, output_path)
+        # Caches of earlier versions of this workbook are no longer read; caches of
+        # other workbooks may still be read by other processes
+        for stale_path in glob.glob(f'{glob.escape(cache_prefix(path, cache_dir))}*.parquet'):
+            if stale_path != output_path:
+                try:
+                    os.remove(stale_path)
+                except OSError:
+                    pass
+    return output_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert the raw Blinkit workbook into a Parquet cache.")
+    parser.add_argument('workbook', nargs='?', default=RAW_WORKBOOK_PATH)
+    parser.add_argument('--cache-dir', default=CACHE_DIR)
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    output_path = ensure_columnar_cache(args.workbook, args.cache_dir)
+    print(f"{output_path} ({time.perf_counter() - started:.3f}s)", file=sys.stderr)
+    print(output_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+import os
+import time
+from dataclasses import dataclass
+
+import pandas as pd
+
+DATASET_PATH = "Blinkit_cleaned_dataset.csv"
+
+# Low-cardinality text columns are stored as categoricals
+CATEGORICAL_COLUMNS = [
+    'Item Fat Content',
+    'Item Identifier',
+    'Item Type',
+    'Outlet Identifier',
+    'Outlet Location Type',
+    'Outlet Size',
+    'Outlet Type',
+]
+
+# Numeric columns are downcast; Sales stays float64 so money totals are unchanged
+NUMERIC_DTYPES = {
+    'Outlet Establishment Year': 'int16',
+    'Item Visibility': 'float32',
+    'Item Weight': 'float32',
+    'Sales': 'float64',
+    'Rating': 'float32',
+}
+
+DATASET_DTYPES = {**{column: 'category' for column in CATEGORICAL_COLUMNS}, **NUMERIC_DTYPES}
+
+
+@dataclass(frozen=True)
+class LoadStats:
+    rows: int
+    load_seconds: float
+    memory_bytes: int
+
+
+def file_signature(path=DATASET_PATH):
+    """Return (path, mtime_ns, size); changes whenever the file is rewritten."""
+    stat = os.stat(path)
+    return os.path.abspath(path), stat.st_mtime_ns, stat.st_size
+
+
+def read_dataset(path=DATASET_PATH):
+    """Parse the cleaned dataset with compact dtypes and report how long it took.
+
+    `path` is the cleaned CSV or a Parquet cache written by columnar.py, which
+    already stores the compact dtypes.
+    """
+    started = time.perf_counter()
+    if str(path).endswith('.parquet'):
+        data_frame = pd.read_parquet(path)
+    else:
+        data_frame = pd.read_csv(path, index_col=0, dtype=DATASET_DTYPES)
+    load_seconds = time.perf_counter() - started
+    stats = LoadStats(
+        rows=len(data_frame),
+        load_seconds=load_seconds,
+        memory_bytes=int(data_frame.memory_usage(deep=True).sum()),
+    )
+    return data_frame, stats
@@ -0,0 +1,209 @@
+"""Mergeable quantile sketches and fixed-bin histograms of the sales measures.
+
+Every (segment, measure) pair gets a Distribution: a t-digest-style quantile
+sketch plus counts over fixed histogram bins. The sketch keeps weighted
+centroids whose size is bounded by the t-digest k1 scale function, so they are
+small near the tails, where p99 is read, and larger around the median. Its
+size depends on the compression, not on the number of rows.
+
+Both halves merge: sketches by recompressing their combined centroids and
+histograms by adding counts, as the bins never move. Partial distributions from
+chunks, shards and appended batches therefore combine like the rest of a
+SalesCube. Rows are sketched in blocks of at most BLOCK_ROWS, so a column is
+never sorted whole.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+SEGMENT_DIMENSIONS = ['Item Type', 'Outlet Type', 'Outlet Size']
+DISTRIBUTION_MEASURES = ['Sales', 'Rating', 'Item Visibility']
+
+# Fixed (low, high, bins) per measure; values outside the range are counted in the end bins
+HISTOGRAM_BINS = {
+    'Sales': (0, 300, 30),
+    'Rating': (1, 5, 16),
+    'Item Visibility': (0, 0.35, 28),
+}
+
+# Summary column -> quantile
+SUMMARY_QUANTILES = {
+    'Median': 0.5,
+    'P90': 0.9,
+    'P99': 0.99,
+}
+
+# At most about compression / 2 centroids are kept per sketch
+DEFAULT_COMPRESSION = 200
+BLOCK_ROWS = 2 ** 20
+
+
+def _unit_starts(row_count, compression):
+    # First row of each cluster of `row_count` sorted unit-weight values: k1 reaches
+    # j - compression / 4 at q = (1 - cos(2 pi j / compression)) / 2
+    units = np.arange(compression // 2 + 1)
+    starts = np.ceil((1 - np.cos(2 * math.pi * units / compression)) / 2 * row_count).astype(np.intp)
+    starts = np.unique(starts)
+    return starts[starts < row_count]
+
+
+def _compress(means, weights, compression):
+    # Merge centroids sorted by mean into clusters that span at most one unit of
+    # k1(q) = compression / (2 pi) * asin(2q - 1), judged at each centroid's left edge
+    total = weights.sum()
+    left_quantiles = (np.cumsum(weights) - weights) / total
+    scale = compression / (2 * math.pi) * np.arcsin(np.clip(2 * left_quantiles - 1, -1, 1))
+    clusters = np.floor(scale + compression / 4).astype(np.intp)
+    clusters -= clusters[0]
+    merged_weights = np.bincount(clusters, weights)
+    kept = merged_weights > 0
+    merged_means = np.bincount(clusters, weights * means)[kept] / merged_weights[kept]
+    return merged_means, merged_weights[kept]
+
+
+class QuantileSketch:
+    def __init__(self, compression=DEFAULT_COMPRESSION, means=None, weights=None,
+                 minimum=math.inf, maximum=-math.inf):
+        self.compression = compression
+        self.means = np.empty(0) if means is None else means
+        self.weights = np.empty(0) if weights is None else weights
+        self.minimum = minimum
+        self.maximum = maximum
+
+    @classmethod
+    def from_sorted(cls, values, compression=DEFAULT_COMPRESSION):
+        """Sketch `values`, which must be sorted ascending."""
+        sketch = cls(compression)
+        if len(values):
+            starts = _unit_starts(len(values), compression)
+            sketch.weights = np.diff(np.append(starts, len(values))).astype('float64')
+            sketch.means = np.add.reduceat(values, starts) / sketch.weights
+            sketch.minimum, sketch.maximum = float(values[0]), float(values[-1])
+        return sketch
+
+    @property
+    def count(self):
+        return int(round(self.weights.sum()))
+
+    def update(self, other):
+        """Merge `other` into this sketch."""
+        if not len(other.weights):
+            return
+        means = np.concatenate([self.means, other.means])
+        weights = np.concatenate([self.weights, other.weights])
+        order = np.argsort(means, kind='stable')
+        self.means, self.weights = _compress(means[order], weights[order], self.compression)
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    def copy(self):
+        return QuantileSketch(self.compression, self.means.copy(), self.weights.copy(), self.minimum, self.maximum)
+
+    def quantile(self, q):
+        """Estimate the `q` quantile(s) by interpolating between centroid midpoints."""
+        if not len(self.weights):
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else math.nan
+        total = self.weights.sum()
+        positions = np.concatenate([[0], np.cumsum(self.weights) - self.weights / 2, [total]])
+        values = np.concatenate([[self.minimum], self.means, [self.maximum]])
+        estimate = np.interp(np.asarray(q, dtype='float64') * total, positions, values)
+        return float(estimate) if not np.ndim(q) else estimate
+
+
+def bin_edges(measure):
+    low, high, bins = HISTOGRAM_BINS[measure]
+    return np.linspace(low, high, bins + 1)
+
+
+def bin_indexes(values, measure):
+    """Return the histogram bin of each value, clipping outliers into the end bins."""
+    low, high, bins = HISTOGRAM_BINS[measure]
+    return np.clip(np.floor((values - low) * (bins / (high - low))), 0, bins - 1).astype(np.intp)
+
+
+class Distribution:
+    """Quantile sketch and fixed-bin histogram of one measure within one segment."""
+
+    def __init__(self, measure, sketch=None, counts=None):
+        self.measure = measure
+        self.sketch = QuantileSketch() if sketch is None else sketch
+        self.counts = np.zeros(HISTOGRAM_BINS[measure][2], dtype=np.int64) if counts is None else counts
+
+    def update(self, other):
+        self.sketch.update(other.sketch)
+        self.counts = self.counts + other.counts
+
+    def copy(self):
+        return Distribution(self.measure, self.sketch.copy(), self.counts.copy())
+
+    def quantile(self, q):
+        return self.sketch.quantile(q)
+
+    def histogram(self):
+        edges = bin_edges(self.measure)
+        return pd.DataFrame({'Bin Start': edges[:-1], 'Bin End': edges[1:], 'Rows': self.counts})
+
+
+def _block_distributions(segment_codes, measures, compression):
+    # segment_codes: dimension -> (codes, segments), code -1 for a missing segment;
+    # measures: measure -> values, NaN for a missing value
+    distributions = {}
+    for measure, values in measures.items():
+        present = ~np.isnan(values)
+        values = values[present]
+        order = np.argsort(values)
+        sorted_values = values[order]
+        bins = bin_indexes(values, measure)
+        bin_count = HISTOGRAM_BINS[measure][2]
+        for dimension, (codes, segments) in segment_codes.items():
+            # Group 0 collects missing segments; a stable (radix) sort of the narrow
+            # group codes keeps the values of each group sorted
+            groups = (codes[present] + 1).astype(np.min_scalar_type(len(segments)))
+            sorted_groups = groups[order]
+            grouped_values = sorted_values[np.argsort(sorted_groups, kind='stable')]
+            bounds = np.concatenate([[0], np.cumsum(np.bincount(sorted_groups, minlength=len(segments) + 1))])
+            counts = np.bincount(groups.astype(np.intp) * bin_count + bins, minlength=(len(segments) + 1) * bin_count)
+            for group, segment in enumerate(segments, start=1):
+                if bounds[group] == bounds[group + 1]:
+                    continue
+                sketch = QuantileSketch.from_sorted(grouped_values[bounds[group]:bounds[group + 1]], compression)
+                distributions[(dimension, str(segment), measure)] = Distribution(
+                    measure, sketch, counts[group * bin_count:(group + 1) * bin_count])
+    return distributions
+
+
+def merge_distributions(target, source):
+    """Merge the distributions in `source` into the dict `target` without mutating `source`."""
+    for key, distribution in source.items():
+        if key in target:
+            target[key].update(distribution)
+        else:
+            target[key] = distribution.copy()
+    return target
+
+
+def segment_distributions(data_frame, rows=None, compression=DEFAULT_COMPRESSION):
+    """Sketch every measure per value of each SEGMENT_DIMENSIONS column.
+
+    `rows` optionally selects rows by boolean mask or positions. Returns a dict
+    of (dimension, segment, measure) -> Distribution.
+    """
+    segment_codes = {}
+    for dimension in SEGMENT_DIMENSIONS:
+        codes, segments = pd.factorize(data_frame[dimension])
+        segment_codes[dimension] = (codes if rows is None else codes[rows], segments)
+    measures = {}
+    for measure in DISTRIBUTION_MEASURES:
+        values = data_frame[measure].to_numpy(dtype='float64')
+        measures[measure] = values if rows is None else values[rows]
+
+    row_count = len(next(iter(measures.values())))
+    distributions = {}
+    for start in range(0, row_count, BLOCK_ROWS):
+        block = slice(start, start + BLOCK_ROWS)
+        merge_distributions(distributions, _block_distributions(
+            {dimension: (codes[block], segments) for dimension, (codes, segments) in segment_codes.items()},
+            {measure: values[block] for measure, values in measures.items()},
+            compression))
+    return distributions
@@ -0,0 +1,116 @@
+"""Server-side sorted, filtered and paginated access to individual sales rows.
+
+Each sortable column gets a presorted row order, built the first time it is
+sorted by. An unfiltered page is a slice of that order. A filtered page walks
+the order in growing blocks and keeps the rows that pass the filter mask, so
+the early pages an analyst actually looks at cost time proportional to the
+page rather than to the dataset. Only the rows of the page are materialized.
+"""
+import math
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+SORT_COLUMNS = ['Sales', 'Rating', 'Item Visibility']
+SEARCH_COLUMNS = ['Item Identifier', 'Outlet Identifier']
+DISPLAY_COLUMNS = [
+    'Item Identifier',
+    'Outlet Identifier',
+    'Item Type',
+    'Item Fat Content',
+    'Outlet Type',
+    'Outlet Location Type',
+    'Outlet Size',
+    'Outlet Establishment Year',
+    'Item Weight',
+    'Item Visibility',
+    'Rating',
+    'Sales',
+]
+DEFAULT_PAGE_SIZE = 50
+
+# Rows examined by the first block of a filtered scan; each next block is twice as large
+MIN_SCAN_BLOCK = 4096
+
+
+@dataclass(frozen=True)
+class DrillDownPage:
+    rows: pd.DataFrame
+    matching_rows: int
+    page: int
+    page_count: int
+
+
+def _contains(values, text):
+    # Match the distinct values once and look the rows up by category code
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        matches = values.cat.categories.str.contains(text, case=False, regex=False)
+        return np.append(matches, False)[values.cat.codes.to_numpy()]
+    return values.str.contains(text, case=False, regex=False).to_numpy(dtype=bool)
+
+
+def _scan(order, mask, start, stop):
+    # Positions of the matches start..stop-1 in `order`, reading blocks of it until enough match
+    found = []
+    matched = 0
+    position = 0
+    block = max(stop * 4, MIN_SCAN_BLOCK)
+    while position < len(order) and matched < stop:
+        rows = order[position:position + block]
+        rows = rows[mask[rows]]
+        found.append(rows)
+        matched += len(rows)
+        position += block
+        block *= 2
+    return np.concatenate(found)[start:stop] if found else order[:0]
+
+
+class DrillDownIndex:
+    def __init__(self, data_frame):
+        self.data_frame = data_frame
+        self._orders = {}
+        # Paging through one search reuses its mask
+        self._last_search = (None, None)
+        self._lock = threading.Lock()
+
+    def order(self, sort_by):
+        """Return the row positions sorted ascending by `sort_by`."""
+        with self._lock:
+            if sort_by not in self._orders:
+                values = self.data_frame[sort_by].to_numpy()
+                self._orders[sort_by] = np.argsort(values, kind='stable').astype(
+                    np.min_scalar_type(max(len(values) - 1, 0)))
+            return self._orders[sort_by]
+
+    def search_mask(self, text):
+        """Return a mask of rows whose item or outlet identifier contains `text`."""
+        last_text, last_mask = self._last_search
+        if text == last_text:
+            return last_mask
+        mask = np.zeros(len(self.data_frame), dtype=bool)
+        for column in SEARCH_COLUMNS:
+            mask |= _contains(self.data_frame[column], text)
+        self._last_search = (text, mask)
+        return mask
+
+    def page(self, sort_by='Sales', descending=True, page=0, page_size=DEFAULT_PAGE_SIZE, mask=None, search=''):
+        """Return one page of rows sorted by `sort_by`, keeping the rows in `mask` that match `search`."""
+        if sort_by not in SORT_COLUMNS:
+            raise ValueError(f"Unsupported sort column: {sort_by!r}")
+        if search:
+            mask = self.search_mask(search) if mask is None else mask & self.search_mask(search)
+
+        order = self.order(sort_by)
+        if descending:
+            order = order[::-1]
+        matching_rows = len(order) if mask is None else int(np.count_nonzero(mask))
+        page_count = max(1, math.ceil(matching_rows / page_size))
+        page = min(max(page, 0), page_count - 1)
+        start, stop = page * page_size, (page + 1) * page_size
+        positions = order[start:stop] if mask is None else _scan(order, mask, start, stop)
+
+        rows = self.data_frame.iloc[positions][DISPLAY_COLUMNS]
+        rows.index = pd.RangeIndex(start + 1, start + 1 + len(rows), name='Rank')
+        return DrillDownPage(rows=rows, matching_rows=matching_rows, page=page, page_count=page_count)
@@ -0,0 +1,86 @@
+"""Headless analytics engine: every dashboard result without Streamlit or Plotly."""
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from aggregates import build_cube
+from data_loader import DATASET_PATH, read_dataset
+from panels import compute_panels, dashboard_tabs
+from parallel import discover_shards, parallel_cube
+from streaming import stream_cube
+
+
+def load_cube(path=DATASET_PATH, memory_cap_mb=None, shard_dir=None, workers=None, distinct_error=None):
+    """Aggregate the sales data in memory, in bounded chunks or across shards.
+
+    Distinct item and outlet counts are exact unless `distinct_error` is given.
+    """
+    if shard_dir:
+        return parallel_cube(discover_shards(shard_dir), workers=workers, distinct_error=distinct_error)
+    if memory_cap_mb:
+        return stream_cube(path, memory_cap_mb=memory_cap_mb, distinct_error=distinct_error)
+    data_frame, _ = read_dataset(path)
+    return build_cube(data_frame, distinct_error)
+
+
+def compute_dashboard(cube, max_workers=None, wrap_panel=None):
+    """Compute every panel of every Analysis tab, including both Fat tab metrics.
+
+    `wrap_panel(name, panel)` optionally returns the function to call in place of
+    each panel, for example to time it.
+    """
+    dashboard = {}
+    for tab, panels, options in dashboard_tabs():
+        if wrap_panel is not None:
+            panels = {name: wrap_panel(name, panel) for name, panel in panels.items()}
+        dashboard[tab] = compute_panels(cube, panels, max_workers, **options)
+    return dashboard
+
+
+def to_jsonable(value):
+    """Convert panel results (DataFrames, Series, NumPy scalars) to plain JSON types."""
+    if isinstance(value, pd.DataFrame):
+        return [to_jsonable(record) for record in value.to_dict('records')]
+    if isinstance(value, pd.Series):
+        return to_jsonable(value.to_dict())
+    if isinstance(value, dict):
+        return {str(key): to_jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(item) for item in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    return value
+
+
+def write_json(dashboard, output_dir):
+    output_path = Path(output_dir) / 'dashboard.json'
+    output_path.write_text(json.dumps(to_jsonable(dashboard), indent=2))
+    return [output_path]
+
+
+def write_parquet(dashboard, output_dir):
+    """Write each panel table to `<tab>.<panel>.parquet` and the insights to insights.json."""
+    output_dir = Path(output_dir)
+    written = []
+    insights = {}
+    for tab, panels in dashboard.items():
+        for panel, result in panels.items():
+            if 'data' in result:
+                table_path = output_dir / f'{tab}.{panel}.parquet'
+                result['data'].to_parquet(table_path, index=False)
+                written.append(table_path)
+            insights.setdefault(tab, {})[panel] = {key: value for key, value in result.items() if key != 'data'}
+    insights_path = output_dir / 'insights.json'
+    insights_path.write_text(json.dumps(to_jsonable(insights), indent=2))
+    written.append(insights_path)
+    return written
+
+
+WRITERS = {
+    'json': write_json,
+    'parquet': write_parquet,
+}
@@ -0,0 +1,77 @@
+"""Bounded LRU cache of built Plotly figures and their serialized JSON payloads.
+
+Entries are keyed by a hash of the chart builder, the content of the input
+aggregate and the chart options, so a chart whose aggregate did not change is
+neither rebuilt nor re-serialized.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import pandas as pd
+import plotly.io
+
+DEFAULT_MAX_ENTRIES = 64
+
+
+@dataclass(frozen=True)
+class CachedFigure:
+    key: str
+    figure: object
+    payload: str
+
+
+def figure_key(builder, data, *options):
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{builder.__module__}.{builder.__qualname__}".encode())
+    digest.update(repr(list(data.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(data, index=True).values.tobytes())
+    digest.update(repr(options).encode())
+    return digest.hexdigest()
+
+
+class FigureCache:
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, builder, data, *options):
+        """Return the CachedFigure for builder(data, *options), building it on a miss."""
+        key = figure_key(builder, data, *options)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        figure = builder(data, *options)
+        cached = CachedFigure(key=key, figure=figure, payload=plotly.io.to_json(figure, validate=False))
+        with self._lock:
+            self._entries[key] = cached
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return cached
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'entries': len(self._entries), 'max_entries': self.max_entries}
+
+    def to_prometheus(self):
+        stats = self.stats()
+        lines = []
+        for name in ('hits', 'misses', 'evictions'):
+            lines.append(f"# TYPE blinkit_figure_cache_{name}_total counter")
+            lines.append(f"blinkit_figure_cache_{name}_total {stats[name]}")
+        lines.append("# TYPE blinkit_figure_cache_entries gauge")
+        lines.append(f"blinkit_figure_cache_entries {stats['entries']}")
+        return "\n".join(lines) + "\n"
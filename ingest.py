@@ -0,0 +1,228 @@
+"""Incremental ingestion of new sales rows into a running SalesCube.
+
+The cleaned CSV is tailed by byte offset, so each poll parses only the rows
+appended since the previous one. Batch files dropped into a directory are read
+once each; write them under a temporary name and rename them into place so a
+half-written file is never picked up. The tail offset and the batch files read
+are only committed once their rows are merged into the cube, so a poll that
+fails leaves them to be read again by the next one.
+
+Rows that cannot be parsed are skipped and counted rather than failing the
+poll, and a batch file that cannot be read at all is skipped until it is
+rewritten, so one bad line or file never holds back the rows after it.
+"""
+import io
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from aggregates import build_cube, merge_cubes
+from data_loader import DATASET_DTYPES, NUMERIC_DTYPES
+
+logger = logging.getLogger('blinkit.ingest')
+
+
+def parse_rows(data, columns=None):
+    """Parse CSV bytes with the dataset dtypes; return (rows, rejected).
+
+    `columns` names the fields when `data` has no header row. Rows that do not
+    parse, such as lines with too many fields or numbers that do not convert,
+    are dropped and counted in `rejected`. Raises ValueError if the data cannot be parsed at all or lacks
+    a dataset column.
+    """
+    header = {} if columns is None else {'header': None, 'names': columns}
+    try:
+        rows, rejected = pd.read_csv(io.BytesIO(data), index_col=0, dtype=DATASET_DTYPES, **header), 0
+    except ValueError:
+        # Slow path: read every field as text, then keep the rows that convert
+        rows = pd.read_csv(io.BytesIO(data), index_col=0, dtype=str, engine='python',
+                           on_bad_lines='skip', **header)
+        numbers = {column: pd.to_numeric(rows[column], errors='coerce')
+                   for column in NUMERIC_DTYPES if column in rows}
+        valid = np.ones(len(rows), dtype=bool)
+        for column, values in numbers.items():
+            parsed = values.notna().to_numpy()
+            # Integer columns cannot hold a missing value
+            valid &= parsed if NUMERIC_DTYPES[column].startswith('int') else parsed | rows[column].isna().to_numpy()
+        rows = rows[valid].astype({column: 'category' for column in DATASET_DTYPES
+                                   if column in rows and column not in numbers})
+        for column, values in numbers.items():
+            rows[column] = values[valid].astype(NUMERIC_DTYPES[column])
+        # Whatever else the parser dropped, such as a line with too many fields, is rejected too
+        lines = sum(1 for line in data.splitlines() if line.strip()) - (columns is None)
+        rejected = lines - len(rows)
+    missing = [column for column in DATASET_DTYPES if column not in rows]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+    return rows, rejected
+
+
+@dataclass(frozen=True)
+class TailPosition:
+    """Where a CsvTail resumes once a read is committed."""
+    offset: int
+    columns: list
+    file_id: tuple
+    # The file was truncated or replaced, so the rows read start over from the top
+    restarted: bool = False
+    # Rows skipped because they could not be parsed
+    rejected: int = 0
+
+
+class CsvTail:
+    """Reads the complete rows appended to a CSV file since the last commit."""
+
+    def __init__(self, path):
+        self.path = path
+        self.offset = 0
+        self.columns = None
+        self.file_id = None
+
+    def read_new_rows(self):
+        """Return (rows, position): the new rows, or None, and the position after them.
+
+        Nothing moves until commit(position), so the same rows are read again until then.
+        """
+        offset, columns = self.offset, self.columns
+        with open(self.path, 'rb') as csv_file:
+            stat = os.fstat(csv_file.fileno())
+            file_id = (stat.st_dev, stat.st_ino)
+            restarted = (self.file_id is not None and file_id != self.file_id) or stat.st_size < offset
+            if restarted:
+                # The file was truncated or replaced; start over from the top
+                offset, columns = 0, None
+            csv_file.seek(offset)
+            chunk = csv_file.read()
+
+        # Leave a trailing partial line for the next poll
+        end = chunk.rfind(b'\n') + 1
+        body = chunk[:end]
+        if body and columns is None:
+            header_end = body.find(b'\n') + 1
+            columns = [''] + list(pd.read_csv(io.BytesIO(body[:header_end]), index_col=0, nrows=0).columns)
+            body = body[header_end:]
+        rows, rejected = None, 0
+        if body:
+            try:
+                rows, rejected = parse_rows(body, columns)
+            except ValueError as error:
+                # Not even parseable line by line (e.g. an unterminated quote); skip
+                # these lines rather than fail on them at every poll
+                logger.error("Skipping unparseable rows in %s: %s", self.path, error)
+                rejected = body.count(b'\n')
+
+        rows = rows if rows is not None and len(rows) else None
+        return rows, TailPosition(offset + end, columns, file_id, restarted, rejected)
+
+    def commit(self, position):
+        self.offset, self.columns, self.file_id = position.offset, position.columns, position.file_id
+
+
+class DropDirectory:
+    """Yields each batch file that appears in a directory until it is committed."""
+
+    def __init__(self, path, pattern='*.csv'):
+        self.path = Path(path)
+        self.pattern = pattern
+        self.seen = set()
+        # Name -> modification time of a batch that could not be read; skipped until rewritten
+        self.quarantined = {}
+
+    def read_new_batches(self, reread=False):
+        """Yield (name, rows, rejected) for every batch not yet committed, or every batch if `reread`."""
+        for batch_path in sorted(self.path.glob(self.pattern)):
+            if batch_path.name in self.seen and not reread:
+                continue
+            modified = None
+            try:
+                modified = batch_path.stat().st_mtime_ns
+                if self.quarantined.get(batch_path.name) == modified:
+                    continue
+                rows, rejected = parse_rows(batch_path.read_bytes())
+            except (OSError, ValueError) as error:
+                logger.error("Skipping batch %s until it is rewritten: %s", batch_path, error)
+                self.quarantined[batch_path.name] = modified
+                continue
+            self.quarantined.pop(batch_path.name, None)
+            yield batch_path.name, rows, rejected
+
+    def commit(self, names, reread=False):
+        self.seen = set(names) if reread else self.seen | set(names)
+
+
+class SalesIngestor:
+    """Keeps a SalesCube current by folding in only newly arrived rows.
+
+    `version` increases every time new rows are applied, so it can be used as a
+    cache key for anything derived from the cube.
+    """
+
+    def __init__(self, csv_path, drop_dir=None, pattern='*.csv', distinct_error=None):
+        self.csv_tail = CsvTail(csv_path)
+        self.drop_directory = DropDirectory(drop_dir, pattern) if drop_dir else None
+        self.distinct_error = distinct_error
+        self.cube = None
+        self.version = 0
+        self.rows_ingested = 0
+        self.rows_rejected = 0
+        self.updated_at = None
+        self._lock = threading.Lock()
+
+    def signature(self):
+        """Return a cheap value that changes whenever the tailed file or a drop batch does."""
+        files = [Path(self.csv_tail.path)]
+        if self.drop_directory is not None:
+            files.extend(sorted(self.drop_directory.path.glob(self.drop_directory.pattern)))
+        signature = []
+        for path in files:
+            stat = path.stat()
+            signature.append((str(path), stat.st_ino, stat.st_size, stat.st_mtime_ns))
+        return tuple(signature)
+
+    def poll(self):
+        """Apply any new rows; returns the number of rows ingested by this call."""
+        with self._lock:
+            rows, position = self.csv_tail.read_new_rows()
+            # A restarted tail rebuilds the cube from scratch, drop batches included
+            cube = None if position.restarted else self.cube
+            batches = [] if rows is None else [rows]
+            batch_names = []
+            rejected = position.rejected
+            if self.drop_directory is not None:
+                for name, batch, batch_rejected in self.drop_directory.read_new_batches(reread=position.restarted):
+                    batch_names.append(name)
+                    rejected += batch_rejected
+                    if len(batch):
+                        batches.append(batch)
+            if batches:
+                partial_cubes = [build_cube(batch, self.distinct_error) for batch in batches]
+                if cube is not None:
+                    partial_cubes.insert(0, cube)
+                cube = merge_cubes(partial_cubes)
+
+            # Everything read is merged; only now do the tail and the batches move on
+            self.csv_tail.commit(position)
+            if self.drop_directory is not None:
+                self.drop_directory.commit(batch_names, reread=position.restarted)
+            if rejected:
+                logger.warning("Skipped %d sales rows that could not be parsed", rejected)
+                self.rows_rejected += rejected
+            if not (batches or position.restarted):
+                return 0
+            new_rows = sum(len(batch) for batch in batches)
+            self.cube = cube
+            self.rows_ingested = (0 if position.restarted else self.rows_ingested) + new_rows
+            self.version += 1
+            self.updated_at = time.time()
+            return new_rows
+
+    def snapshot(self):
+        """Return a consistent (version, cube) pair."""
+        with self._lock:
+            return self.version, self.cube
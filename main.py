@@ -1,20 +1,705 @@
+import json
+import os
+import time
+from collections import deque
+
 import pandas as pd
-import plotly.express as px
 import streamlit as st
 from streamlit_option_menu import option_menu
 
-# Reading the dataset
-data_frame = pd.read_csv("Blinkit_cleaned_dataset.csv")
+import charts
+from aggregates import build_cube
+from columnar import ensure_columnar_cache
+from data_loader import DATASET_PATH, file_signature, read_dataset
+from distributions import DISTRIBUTION_MEASURES
+from drilldown import SORT_COLUMNS
+from figure_cache import FigureCache
+from ingest import SalesIngestor
+from panels import FAT_METRICS, TAB_PANELS, compute_panels, distribution_tab_key, fat_tab_key
+from parallel import discover_shards, parallel_cube, shards_signature
+from profiling import PROFILED_PANEL_WORKERS, Profiler, profiled, serve_metrics
+from shared_store import materialize, open_cube, open_dataset
+from slicers import SLICER_COLUMNS
+from streaming import stream_cube
+from warmup import BackgroundRefresher, warm_snapshot
+
+# Incremental ingestion: BLINKIT_INGEST=1 tails the cleaned CSV for appended rows,
+# BLINKIT_DROP_DIR also picks up new batch files dropped into that directory
+INGEST_DROP_DIR = os.environ.get("BLINKIT_DROP_DIR")
+INGEST_ENABLED = os.environ.get("BLINKIT_INGEST") == "1" or bool(INGEST_DROP_DIR)
+INGEST_POLL_SECONDS = 5
+
+# Raw workbook: BLINKIT_WORKBOOK converts the Excel export into a cleaned Parquet
+# cache, reconverted only when the workbook content changes, and reads that cache
+# instead of the cleaned CSV
+WORKBOOK_PATH = os.environ.get("BLINKIT_WORKBOOK")
+
+# Streaming mode: BLINKIT_MEMORY_CAP_MB aggregates the CSV in chunks that fit the
+# given memory cap instead of loading it into one DataFrame
+STREAMING_MEMORY_CAP_MB = os.environ.get("BLINKIT_MEMORY_CAP_MB")
+STREAMING_ENABLED = bool(STREAMING_MEMORY_CAP_MB)
+
+# Sharded mode: BLINKIT_SHARD_DIR aggregates every CSV shard under that directory
+# on a process pool of BLINKIT_WORKERS processes (default: one per CPU)
+SHARD_DIR = os.environ.get("BLINKIT_SHARD_DIR")
+SHARD_WORKERS = int(os.environ.get("BLINKIT_WORKERS", 0)) or None
+
+# Shared store: BLINKIT_SHARED_STORE=/dev/shm/blinkit materializes the dataset and
+# its cube once as Arrow files in that directory, which every server process maps
+# read-only instead of holding a private copy
+SHARED_STORE_DIR = os.environ.get("BLINKIT_SHARED_STORE")
+
+# Approximate distinct counts: BLINKIT_DISTINCT_ERROR=0.01 counts unique items and
+# outlets with mergeable HyperLogLog sketches within that relative error instead
+# of exact sets; slicer results stay exact
+DISTINCT_ERROR = float(os.environ.get("BLINKIT_DISTINCT_ERROR", 0)) or None
+
+# Background refresh: the data is loaded and every panel precomputed off the
+# request path; the source is checked for changes every BLINKIT_REFRESH_SECONDS
+# and the last good results are served while a refresh runs
+REFRESH_POLL_SECONDS = float(os.environ.get("BLINKIT_REFRESH_SECONDS", 5))
+
+# Profiling: BLINKIT_PROFILE=1 records per-stage wall/CPU time and allocations and
+# shows them in a sidebar debug panel; BLINKIT_PROFILE_LOG=1 also logs every stage
+# as a JSON line and BLINKIT_METRICS_PORT serves Prometheus text at /metrics on
+# BLINKIT_METRICS_HOST (default: localhost only)
+PROFILING_ENABLED = os.environ.get("BLINKIT_PROFILE") == "1"
+PROFILING_LOG = os.environ.get("BLINKIT_PROFILE_LOG") == "1"
+METRICS_PORT = os.environ.get("BLINKIT_METRICS_PORT")
+METRICS_HOST = os.environ.get("BLINKIT_METRICS_HOST", "127.0.0.1")
+PROFILE_HISTORY = 20
+PANEL_WORKERS = PROFILED_PANEL_WORKERS if PROFILING_ENABLED else None
+
+# Built figures and their JSON payloads kept per server process
+FIGURE_CACHE_SIZE = int(os.environ.get("BLINKIT_FIGURE_CACHE_SIZE", 64))
+PLOTLY_CHART_CONFIG = json.dumps({"showLink": False, "linkText": False})
+
+
+def load_plotly_chart_proto():
+    """Return the PlotlyChart proto class if cached payloads can be sent as-is, else None.
+
+    This relies on Streamlit internals, so it is only used on the 1.34 series
+    whose proto layout it reproduces; other versions use st.plotly_chart.
+    """
+    if not st.__version__.startswith("1.34.") or not hasattr(st._main, "_enqueue"):
+        return None
+    try:
+        from streamlit.proto.PlotlyChart_pb2 import PlotlyChart
+    except ImportError:
+        return None
+    fields = PlotlyChart.DESCRIPTOR.fields_by_name
+    if not {"figure", "theme"} <= set(fields) or not {"spec", "config"} <= set(
+            fields["figure"].message_type.fields_by_name):
+        return None
+    return PlotlyChart
+
+
+PlotlyChartProto = load_plotly_chart_proto()
+
+# Slicers filter the rows behind every Analysis panel and the drill-down pages
+# through individual rows; both need the row-level data, so they are only
+# offered when the dataset is loaded into memory
+ROWS_IN_MEMORY = not (INGEST_ENABLED or SHARD_DIR or STREAMING_ENABLED)
+YEAR_SLICER = 'Outlet Establishment Year'
+SLICED_CUBE_CACHE_SIZE = 8
+DRILLDOWN_PAGE_SIZES = [25, 50, 100, 250]
+
+# Display format of each Distributions tab measure
+DISTRIBUTION_FORMATS = {
+    'Sales': '${:,.2f}',
+    'Rating': '{:.2f}',
+    'Item Visibility': '{:.3f}',
+}
+
+
+@st.cache_resource
+def load_figure_cache():
+    return FigureCache(max_entries=FIGURE_CACHE_SIZE)
+
+
+@st.cache_resource
+def load_profiler():
+    profiler = Profiler(enabled=PROFILING_ENABLED, log_records=PROFILING_LOG)
+    profiler.collectors.append(load_figure_cache().to_prometheus)
+    if PROFILING_ENABLED and METRICS_PORT:
+        # Only the first server process on a host binds the port; the others log it and go on
+        serve_metrics(profiler, int(METRICS_PORT), METRICS_HOST)
+    return profiler
+
+
+def start_profile_run(label):
+    run = load_profiler().new_run(label)
+    if PROFILING_ENABLED:
+        st.session_state.setdefault('profile_runs', deque(maxlen=PROFILE_HISTORY)).append(run)
+    return run
+
+
+def data_signature(ingestor=None):
+    """Return a cheap signature of the source data; a change triggers a refresh."""
+    if ingestor is not None:
+        return ingestor.signature()
+    if SHARD_DIR:
+        return shards_signature(discover_shards(SHARD_DIR))
+    return file_signature(WORKBOOK_PATH or DATASET_PATH)
+
+
+def load_data(signature, run, ingestor=None):
+    """Load one version of the source data; returns (cube, data_frame, load_stats).
+
+    Only the default in-memory mode keeps the rows (data_frame and load_stats).
+    In ingest mode only the rows that arrived since the last version are read.
+    """
+    if ingestor is not None:
+        with run.stage('aggregate', 'ingest'):
+            ingestor.poll()
+        return ingestor.snapshot()[1], None, None
+    if SHARD_DIR:
+        with run.stage('aggregate', 'shards'):
+            cube = parallel_cube([path for path, _, _ in signature], workers=SHARD_WORKERS,
+                                 distinct_error=DISTINCT_ERROR)
+        return cube, None, None
+    path = signature[0]
+    if WORKBOOK_PATH:
+        with run.stage('load', 'workbook'):
+            path = ensure_columnar_cache(path)
+    if STREAMING_ENABLED:
+        with run.stage('aggregate', 'stream'):
+            cube = stream_cube(path, memory_cap_mb=float(STREAMING_MEMORY_CAP_MB), distinct_error=DISTINCT_ERROR)
+        return cube, None, None
+    if SHARED_STORE_DIR:
+        with run.stage('load', 'shared_store'):
+            paths = materialize(file_signature(path), SHARED_STORE_DIR, distinct_error=DISTINCT_ERROR)
+            data_frame, load_stats = open_dataset(paths)
+            cube = open_cube(paths)
+        return cube, data_frame, load_stats
+    with run.stage('load'):
+        data_frame, load_stats = read_dataset(path)
+    with run.stage('aggregate', 'cube'):
+        cube = build_cube(data_frame, DISTINCT_ERROR)
+    return cube, data_frame, load_stats
+
+
+def build_snapshot(signature, run, figure_cache, ingestor=None):
+    cube, data_frame, load_stats = load_data(signature, run, ingestor)
+    if cube is None:
+        # Ingest mode before any rows have arrived
+        return None
+    return warm_snapshot(signature, cube, data_frame, load_stats, run=run, figure_cache=figure_cache,
+                         panel_workers=PANEL_WORKERS)
+
+
+# One refresher thread per server process, started by the first session; in
+# ingest mode it also polls for new rows, so no request waits on a poll
+@st.cache_resource
+def load_refresher():
+    figure_cache = load_figure_cache()
+    ingestor = load_ingestor(DATASET_PATH, INGEST_DROP_DIR) if INGEST_ENABLED else None
+    return BackgroundRefresher(lambda: data_signature(ingestor),
+                               lambda signature, run: build_snapshot(signature, run, figure_cache, ingestor),
+                               poll_seconds=REFRESH_POLL_SECONDS, profiler=load_profiler()).start()
+
+
+def current_snapshot():
+    """Return the latest complete snapshot; only the very first one is waited for."""
+    refresher = load_refresher()
+    snapshot = refresher.snapshot
+    if snapshot is None:
+        with st.spinner("Warming up the dashboard..."):
+            snapshot = refresher.wait_ready()
+    if snapshot is None:
+        if refresher.last_error is None:
+            st.info("Waiting for sales rows to be ingested...")
+        else:
+            st.error(f"Could not load the sales data: {refresher.last_error}. Retrying in the background.")
+        st.stop()
+    if INGEST_ENABLED and refresher.last_error is not None:
+        st.warning(f"Could not ingest the latest sales rows, showing the rows ingested so far: {refresher.last_error}")
+    return snapshot
+
+
+# Recent slicer combinations are shared across sessions and tabs; the segment
+# distributions of a slice are only sketched for the Distributions tab
+@st.cache_resource(max_entries=SLICED_CUBE_CACHE_SIZE, show_spinner=False)
+def load_sliced_cube(signature, filters, _snapshot, distributions=False):
+    data_frame = _snapshot.data_frame if distributions else None
+    return _snapshot.slicer_index.sliced_cube(_snapshot.cube, dict(filters), data_frame)
+
+
+def current_slicer_filters(slicer_index):
+    """Return the active slicer selections as a hashable tuple of (column, values)."""
+    filters = {column: st.session_state.get(f"slicer_{column}", [])
+               for column in SLICER_COLUMNS if column != YEAR_SLICER}
+    years = slicer_index.values[YEAR_SLICER]
+    first_year, last_year = st.session_state.get("slicer_year_range", (years[0], years[-1]))
+    filters[YEAR_SLICER] = [year for year in years if first_year <= year <= last_year]
+    return tuple((column, tuple(values)) for column, values in slicer_index.normalize(filters).items())
+
+
+def render_slicers(slicer_index):
+    st.subheader("Slicers")
+    for column in SLICER_COLUMNS:
+        if column != YEAR_SLICER:
+            st.multiselect(column, slicer_index.values[column], placeholder="All", key=f"slicer_{column}")
+    years = slicer_index.values[YEAR_SLICER]
+    st.select_slider(YEAR_SLICER, years, value=(years[0], years[-1]), key="slicer_year_range")
+
+
+# A single ingestor per server process, polled by the refresher thread
+@st.cache_resource
+def load_ingestor(path, drop_dir):
+    return SalesIngestor(path, drop_dir, distinct_error=DISTINCT_ERROR)
+
+
+def current_sales_cube(run, distributions=False):
+    """Return (cube_key, cube) for the freshest data; cube_key changes with the data.
+
+    A sliced cube only has segment distributions if `distributions` is set.
+    """
+    snapshot = current_snapshot()
+    filters = current_slicer_filters(snapshot.slicer_index) if snapshot.slicer_index else ()
+    if not filters:
+        return snapshot.signature, snapshot.cube
+    with run.stage('aggregate', 'slicers'):
+        cube = load_sliced_cube(snapshot.signature, filters, snapshot, distributions)
+    if cube.row_count == 0:
+        st.warning("No sales match the selected slicers.")
+        st.stop()
+    return (snapshot.signature, filters), cube
+
+
+# Panel results are cached per dataset version, tab and options; the panels of a
+# tab are computed concurrently on a thread pool, except while profiling
+@st.cache_data(max_entries=16, show_spinner=False)
+def load_tab_panels(signature, tab, _cube, _run, **options):
+    panels = {name: profiled(_run, 'compute', name, compute) for name, compute in TAB_PANELS[tab].items()}
+    return compute_panels(_cube, panels, PANEL_WORKERS, **options)
+
+
+def current_panels(run, tab, view=None, **options):
+    """Return the panels of `tab` for the freshest data and the active slicers.
+
+    Without slicers they come precomputed with the snapshot, where `view` names
+    them if it differs from `tab`.
+    """
+    snapshot = current_snapshot()
+    if not (snapshot.slicer_index and current_slicer_filters(snapshot.slicer_index)):
+        return snapshot.dashboard[view or tab]
+    cube_key, cube = current_sales_cube(run, distributions=(tab == 'distribution'))
+    return load_tab_panels(cube_key, tab, cube, run, **options)
+
+
+def send_plotly_payload(payload):
+    # st.plotly_chart re-serializes the figure on every call, so enqueue the same
+    # proto it builds (streamlit 1.34) with the cached JSON payload instead
+    proto = PlotlyChartProto()
+    proto.figure.spec = payload
+    proto.figure.config = PLOTLY_CHART_CONFIG
+    proto.theme = "streamlit"
+    st._main._enqueue("plotly_chart", proto)
+
+
+def plot_panel(run, panel, builder, *args):
+    with run.stage('figure', panel):
+        cached_figure = load_figure_cache().get_or_build(builder, *args)
+    with run.stage('render', panel):
+        if PlotlyChartProto is not None:
+            send_plotly_payload(cached_figure.payload)
+        else:
+            # The figure is still not rebuilt, only re-serialized
+            st.plotly_chart(cached_figure.figure)
+
+
+def write_spacer(lines):
+    for _ in range(lines):
+        st.write("")
+
+
+# Each tab is a fragment, so a widget change inside one tab reruns only that tab.
+# Each chart-plus-Key-Insights block below is rendered from its own panel result.
+# In ingest mode the fragments also rerun on a timer to pick up new rows.
+refresh_interval = INGEST_POLL_SECONDS if INGEST_ENABLED else None
+
+
+@st.experimental_fragment(run_every=refresh_interval)
+def render_overview_tab():
+    run = start_profile_run('overview')
+    panels = current_panels(run, 'overview')
+    render_key_metrics(panels['key_metrics'], run)
+    st.divider()
+    render_item_type_sales(panels['item_type_sales'], run)
+    st.divider()
+    render_outlet_type_sales(panels['outlet_type_sales'], run)
+    st.divider()
+    render_location_type_sales(panels['location_type_sales'], run)
+    st.divider()
+    render_item_visibility(panels['item_visibility'], run)
+    st.divider()
+
+
+def render_key_metrics(key_metrics, run):
+    with run.stage('render', 'key_metrics'):
+        # Display metrics in columns
+        col1, col2, col3, col4, col5 = st.columns([1.5, 1, 1, 1, 1])
+        col1.metric(":blue[Total Sales]", f"${key_metrics['total_sales']:,.2f}")
+        col2.metric(":blue[Avg Sales]", f"${key_metrics['average_sales']:,.2f}")
+        col3.metric(":blue[Average Rating]", f"{key_metrics['average_rating']:.1f}")
+        col4.metric(":blue[Number of Items]", key_metrics['unique_items'])
+        col5.metric(":blue[Total Outlets]", key_metrics['unique_outlets'])
+
+
+def render_item_type_sales(panel, run):
+    # Sales by Item Type Pie Chart
+    st.subheader("Sales by Item Type")
+
+    highest_sales_item = panel['highest']
+    lowest_sales_item = panel['lowest']
+
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        plot_panel(run, 'item_type_sales', charts.item_type_pie, panel['data'])
+
+    with col2:
+        # Highlighting key insights
+        st.markdown(f"**Out of {panel['type_count']} Total Types**")
+        st.markdown(f"**:green[Highest Sales Type:]** {highest_sales_item['Item Type']}")
+        st.markdown(f"**:green[Sales Amount:]** ${highest_sales_item['Sales']:,.2f}")
+        st.markdown(f"**:green[Percentage of Total Sales:]** {highest_sales_item['Percentage']:.2f}%")
+        st.divider()
+        st.markdown(f"**:orange[Lowest Sales Type:]** {lowest_sales_item['Item Type']}")
+        st.markdown(f"**:orange[Sales Amount:]** ${lowest_sales_item['Sales']:,.2f}")
+        st.markdown(f"**:orange[Percentage of Total Sales:]** {lowest_sales_item['Percentage']:.2f}%")
+
+
+def render_outlet_type_sales(panel, run):
+    # Total Sales by Outlet Type (Pie Chart)
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        plot_panel(run, 'outlet_type_sales', charts.outlet_type_donut, panel['data'])
+    with col2:
+        highest_sales_outlet = panel['highest']
+        lowest_sales_outlet = panel['lowest']
+
+        write_spacer(8)
+        st.subheader(":blue[Key Insights]")
+        st.markdown(f"**Total Sales:** ${panel['total']:,.2f}")
+        st.markdown(f"**:green[Highest Sales Outlet Type:]** {highest_sales_outlet['Outlet Type']} - ${highest_sales_outlet['Sales']:,.2f}")
+        st.markdown(f"**:orange[Lowest Sales Outlet Type:]** {lowest_sales_outlet['Outlet Type']} - ${lowest_sales_outlet['Sales']:,.2f}")
+
+
+def render_location_type_sales(panel, run):
+    # Sales by Outlet Location Type (Horizontal Bar Chart)
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        plot_panel(run, 'location_type_sales', charts.location_type_bar, panel['data'])
+    with col2:
+        highest_sales_location = panel['highest']
+        lowest_sales_location = panel['lowest']
+
+        # Displaying key insights
+        write_spacer(10)
+        st.subheader(":blue[Key Insights]")
+        st.markdown(f"**:green[Highest Sales Location:]** {highest_sales_location['Outlet Location Type']} - ${highest_sales_location['Sales']:,.2f}")
+        st.markdown(f"**:orange[Lowest Sales Location:]** {lowest_sales_location['Outlet Location Type']} - ${lowest_sales_location['Sales']:,.2f}")
+
+
+def render_item_visibility(panel, run):
+    # Item Visibility by Item Type (Bar Chart)
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        plot_panel(run, 'item_visibility', charts.item_visibility_bar, panel['data'])
+
+    with col2:
+        highest_avg_visibility_type = panel['highest']
+        lowest_avg_visibility_type = panel['lowest']
+
+        # Displaying key insights
+        write_spacer(8)
+        st.subheader(":blue[Key Insights]")
+        st.markdown(f"**:green[Highest Average Visibility Item Type:]** {highest_avg_visibility_type['Item Type']} - {highest_avg_visibility_type['Item Visibility']:.2f}")
+        st.markdown(f"**:orange[Lowest Average Visibility Item Type:]** {lowest_avg_visibility_type['Item Type']} - {lowest_avg_visibility_type['Item Visibility']:.2f}")
+
+
+@st.experimental_fragment(run_every=refresh_interval)
+def render_fat_analysis_tab():
+    st.header("Fat Based Analysis")
+
+    # Metric Selector
+    selected_metric = st.selectbox("Select Metric to Visualize:", list(FAT_METRICS))
+    st.divider()
+    # Calculate Sales Based on Selected Metric
+    sales_aggregation = FAT_METRICS[selected_metric]
+    run = start_profile_run('fat')
+    panels = current_panels(run, 'fat', fat_tab_key(selected_metric), how=sales_aggregation)
+
+    render_fat_content_sales(panels['fat_content_sales'], selected_metric, run)
+    st.divider()
+    render_location_fat_sales(panels['location_fat_sales'], selected_metric, run)
+    st.divider()
+
+    # Item Type Horizontal Bar Chart
+    plot_panel(run, 'item_type_metric_sales', charts.item_type_metric_bar,
+               panels['item_type_metric_sales']['data'], selected_metric)
+    st.divider()
+
+
+def render_fat_content_sales(panel, selected_metric, run):
+    # Fat Content Sales Pie Chart
+    col1, col2 = st.columns([2, 1])  # Create two columns for the pie chart and insights
+    with col1:
+        plot_panel(run, 'fat_content_sales', charts.fat_content_donut, panel['data'], selected_metric)
+    with col2:
+        highest_fat_sales = panel['highest']
+        lowest_fat_sales = panel['lowest']
+
+        write_spacer(8)
+        st.subheader(":blue[Key Insights]")
+        st.markdown(f"**Total Sales by Fat Content:** ${panel['total']:,.2f}")
+        st.markdown(f"**:green[Highest Fat Content Sales:]** {highest_fat_sales['Item Fat Content']} - ${highest_fat_sales['Sales']:,.2f}")
+        st.markdown(f"**:orange[Lowest Fat Content Sales:]** {lowest_fat_sales['Item Fat Content']} - ${lowest_fat_sales['Sales']:,.2f}")
+
+
+def render_location_fat_sales(panel, selected_metric, run):
+    # Fat Content by Outlet Location Type Bar Chart
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        plot_panel(run, 'location_fat_sales', charts.location_fat_bar, panel['data'], selected_metric)
+    with col2:
+        highest_outlet_fat_sales = panel['highest']
+        lowest_outlet_fat_sales = panel['lowest']
+
+        write_spacer(9)
+        st.subheader(":blue[Key Insights]")
+        st.markdown(f"**:green[Highest Outlet Sales for Fat Content:]** {highest_outlet_fat_sales['Outlet Location Type']} - ${highest_outlet_fat_sales['Sales']:,.2f}")
+        st.markdown(f"**:orange[Lowest Outlet Sales for Fat Content:]** {lowest_outlet_fat_sales['Outlet Location Type']} - ${lowest_outlet_fat_sales['Sales']:,.2f}")
+
+
+@st.experimental_fragment(run_every=refresh_interval)
+def render_outlet_analysis_tab():
+    st.header("Outlet-Based Analysis")
+
+    st.divider()
+
+    run = start_profile_run('outlet')
+    panels = current_panels(run, 'outlet')
+    render_sales_by_year(panels['sales_by_year'], run)
+    st.divider()
+    render_outlet_location_sales(panels['outlet_location_sales'], run)
+    st.divider()
+    render_outlet_size_sales(panels['outlet_size_sales'], run)
+    st.divider()
+    render_outlet_metrics(panels['outlet_metrics'], run)
+    st.divider()
+
+
+def render_sales_by_year(panel, run):
+    # Sales by Outlet Establishment Year
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        plot_panel(run, 'sales_by_year', charts.sales_by_year_line, panel['data'])
+    with col2:
+        # Key insights for the line chart
+        write_spacer(8)
+        st.subheader(":blue[Key Insights]")
+        st.markdown(f"**Total Sales:** ${panel['total']:,.2f}")
+        st.markdown(f"**:orange[Sales in Latest Year:]** ${panel['latest']:,.2f}")
+        st.markdown(f"**:green[Growth Rate:]** {panel['growth_rate']:.2f}%")
+
+
+def render_outlet_location_sales(panel, run):
+    # Sales by Outlet Location Type
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        plot_panel(run, 'outlet_location_sales', charts.outlet_location_bar, panel['data'])
+    with col2:
+        # Key insights for the bar chart
+        highest_sales_outlet = panel['highest']
+        lowest_sales_outlet = panel['lowest']
+
+        write_spacer(9)
+        st.subheader(":blue[Key Insights]")
+        st.markdown(f"**:green[Highest Sales Outlet Type:]** {highest_sales_outlet['Outlet Location Type']} - ${highest_sales_outlet['Sales']:,.2f}")
+        st.markdown(f"**:orange[Lowest Sales Outlet Type:]** {lowest_sales_outlet['Outlet Location Type']} - ${lowest_sales_outlet['Sales']:,.2f}")
+
+
+def render_outlet_size_sales(panel, run):
+    # Sales by Outlet Size (Donut Chart)
+    col1, col2 = st.columns([2, 1])  # Create two columns
+    with col1:
+        plot_panel(run, 'outlet_size_sales', charts.outlet_size_donut, panel['data'])
+    with col2:
+        # Key insights for the donut chart
+        write_spacer(7)
+        st.subheader(":blue[Key Insights]")
+        st.markdown(f"**Sales by High Outlets:** ${panel['high']:,.2f}")
+        st.markdown(f"**Sales by Small Outlets:** ${panel['small']:,.2f}")
+        st.markdown(f"**Sales by Medium Outlets:** ${panel['medium']:,.2f}")
+
+
+def render_outlet_metrics(panel, run):
+    # Display the metrics table in Streamlit
+    st.subheader("Outlet Type Metrics Table")
+    with run.stage('render', 'outlet_metrics'):
+        st.dataframe(panel['data'].style.format({
+            'Total Sales': '${:,.2f}',  # Format as currency with 2 decimal places
+            'Avg Sales': '${:,.2f}',    # Format as currency with 2 decimal places
+            'Avg Rating': '{:.2f}',     # Format as rating with 2 decimal places
+            'Avg Item Visibility': '{:.2f}'  # Format item visibility with 2 decimal places
+        }))
+
+
+@st.experimental_fragment(run_every=refresh_interval)
+def render_distribution_tab():
+    st.header("Distribution Analysis")
+
+    # Measure Selector
+    selected_measure = st.selectbox("Select Measure to Visualize:", DISTRIBUTION_MEASURES)
+    st.divider()
+    run = start_profile_run('distribution')
+    panels = current_panels(run, 'distribution', distribution_tab_key(selected_measure), measure=selected_measure)
+
+    render_segment_distribution(panels['item_type_distribution'], 'item_type_distribution', selected_measure, run)
+    st.divider()
+    render_segment_distribution(panels['outlet_type_distribution'], 'outlet_type_distribution', selected_measure, run)
+    st.divider()
+    render_segment_distribution(panels['outlet_size_distribution'], 'outlet_size_distribution', selected_measure, run)
+    st.divider()
+
+
+def render_segment_distribution(panel, name, selected_measure, run):
+    # Histogram of the measure per segment, with its median, p90 and p99 below
+    dimension = panel['dimension']
+    value_format = DISTRIBUTION_FORMATS[selected_measure]
+    st.subheader(f"{selected_measure} Distribution by {dimension}")
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        plot_panel(run, name, charts.distribution_histogram, panel['histogram'], dimension, selected_measure)
+    with col2:
+        highest = panel['highest']
+        lowest = panel['lowest']
+        longest_tail = panel['longest_tail']
+
+        write_spacer(8)
+        st.subheader(":blue[Key Insights]")
+        st.markdown(f"**:green[Highest Median:]** {highest[dimension]} - {value_format.format(highest['Median'])}")
+        st.markdown(f"**:orange[Lowest Median:]** {lowest[dimension]} - {value_format.format(lowest['Median'])}")
+        st.markdown(f"**Longest Tail:** {longest_tail[dimension]} - P99 {value_format.format(longest_tail['P99'])} "
+                    f"vs median {value_format.format(longest_tail['Median'])}")
+    with run.stage('render', name):
+        st.dataframe(panel['data'].style.format({
+            'Rows': '{:,}',
+            'Mean': value_format,
+            'Median': value_format,
+            'P90': value_format,
+            'P99': value_format,
+        }), hide_index=True, use_container_width=True)
+
+
+def reset_drilldown_page():
+    st.session_state['drilldown_page'] = 1
+
+
+# Paging, sorting and searching rerun only this tab; only the visible page is
+# taken from the data, styled and sent to the browser
+@st.experimental_fragment
+def render_drilldown_tab():
+    st.header("Item Drill-Down")
+    if not ROWS_IN_MEMORY:
+        st.info("The drill-down needs the row-level data, which is only loaded in the default in-memory mode.")
+        return
+
+    run = start_profile_run('drilldown')
+    snapshot = current_snapshot()
+    col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
+    # A new search, sort or page size starts again from the first page
+    search = col1.text_input("Search Item or Outlet Identifier", placeholder="e.g. FDX32 or OUT049",
+                             on_change=reset_drilldown_page)
+    sort_by = col2.selectbox("Sort by", SORT_COLUMNS, on_change=reset_drilldown_page)
+    descending = col3.selectbox("Order", ["Highest first", "Lowest first"],
+                                on_change=reset_drilldown_page) == "Highest first"
+    page_size = col4.selectbox("Rows per page", DRILLDOWN_PAGE_SIZES, index=1, on_change=reset_drilldown_page)
+
+    with run.stage('compute', 'drilldown'):
+        filters = current_slicer_filters(snapshot.slicer_index)
+        mask = snapshot.slicer_index.mask(dict(filters)) if filters else None
+        page = snapshot.drilldown_index.page(sort_by, descending, st.session_state.get('drilldown_page', 1) - 1,
+                                             page_size, mask=mask, search=search.strip())
+    if st.session_state.get('drilldown_page', 1) > page.page_count:
+        st.session_state['drilldown_page'] = page.page_count
+
+    st.caption(f"{page.matching_rows:,} matching rows · page {page.page + 1:,} of {page.page_count:,}")
+    with run.stage('render', 'drilldown'):
+        st.dataframe(page.rows.style.format({
+            'Item Weight': '{:.2f}',
+            'Item Visibility': '{:.3f}',
+            'Rating': '{:.1f}',
+            'Sales': '${:,.2f}',
+        }), use_container_width=True)
+    st.number_input("Page", min_value=1, max_value=page.page_count, key='drilldown_page')
+
+
+def render_profiling_panel():
+    runs = list(st.session_state.get('profile_runs', ()))
+    if load_refresher().last_run is not None:
+        # The latest background refresh, which did the loading and precomputing
+        runs.insert(0, load_refresher().last_run)
+    latest_runs = {run.label: run for run in runs}
+    with st.sidebar.expander("Profiling", expanded=False):
+        for label, run in latest_runs.items():
+            records = pd.DataFrame([{
+                'Stage': record.stage,
+                'Panel': record.panel,
+                'Wall (ms)': record.wall_seconds * 1000,
+                'CPU (ms)': record.cpu_seconds * 1000,
+                'Allocated (KB)': record.allocated_bytes / 1024,
+            } for record in run.records])
+            st.markdown(f"**{label}** · run {run.run_id} · "
+                        f"{time.strftime('%H:%M:%S', time.localtime(run.started_at))}")
+            st.dataframe(records.style.format(precision=1), hide_index=True)
+        cache_stats = load_figure_cache().stats()
+        st.caption(f"Figure cache: {cache_stats['hits']:,} hits · {cache_stats['misses']:,} misses · "
+                   f"{cache_stats['evictions']:,} evictions · {cache_stats['entries']}/{cache_stats['max_entries']} entries")
+        st.download_button("Export Prometheus metrics", load_profiler().to_prometheus(),
+                           file_name="blinkit_metrics.txt", mime="text/plain")
+
 
 # Streamlit setup
 st.set_page_config(page_title="Blinkit Sales Analysis", layout="wide")
 st.title(":green[Blinkit] Sales Analysis")
 
+# The dataset is read and aggregated by the background refresher
+page_run = start_profile_run('page')
+if not INGEST_ENABLED:
+    with page_run.stage('load', 'snapshot'):
+        snapshot = current_snapshot()
+
 # Sidebar menu
 with st.sidebar:
     selected_menu = option_menu("Menu", ["Home", "Analysis", "About"],
                                  icons=['house', 'activity', 'info-circle-fill'],
                                  menu_icon="cast", default_index=1)
+    if INGEST_ENABLED:
+        ingestor = load_ingestor(DATASET_PATH, INGEST_DROP_DIR)
+        if ingestor.updated_at is not None:
+            st.caption(f"{ingestor.rows_ingested:,} rows ingested · last update "
+                       f"{time.strftime('%H:%M:%S', time.localtime(ingestor.updated_at))}")
+        if ingestor.rows_rejected:
+            st.caption(f"{ingestor.rows_rejected:,} unparseable rows skipped")
+    elif SHARD_DIR:
+        st.caption(f"Sharded mode · {len(discover_shards(SHARD_DIR)):,} shards")
+    elif STREAMING_ENABLED:
+        st.caption(f"Streaming mode · {STREAMING_MEMORY_CAP_MB} MB memory cap")
+    else:
+        load_stats = snapshot.load_stats
+        st.caption(f"{load_stats.rows:,} rows loaded in {load_stats.load_seconds * 1000:,.0f} ms "
+                   f"· {load_stats.memory_bytes / 1024 ** 2:,.2f} MB {'mapped' if SHARED_STORE_DIR else 'in memory'}")
+    if not INGEST_ENABLED:
+        refresher = load_refresher()
+        st.caption(f"Data as of {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(snapshot.as_of))}"
+                   + (" · refreshing..." if refresher.refreshing else ""))
+        if refresher.last_error is not None:
+            st.caption(f":orange[Last refresh failed ({refresher.last_error}); showing the data above]")
+    if ROWS_IN_MEMORY and selected_menu == "Analysis":
+        render_slicers(snapshot.slicer_index)
 
 # Home tab
 if selected_menu == "Home":
@@ -59,387 +744,46 @@ if selected_menu == "Home":
     - **Sales by Outlet Size:** A donut chart visualizes sales by outlet size, supplemented by key insights.
     - **Outlet Metrics Table:** Displays a comprehensive table summarizing metrics for different outlet types, including total sales, number of items, average sales, average rating, and average item visibility.
     """)
+
+    # Distribution Analysis
+    st.write("### Distribution Analysis:")
+    st.write("""
+    - **Measure Selector:** Users can choose between sales, rating and item visibility.
+    - **Segment Distributions:** Histograms and a median, p90 and p99 table of the selected measure by item type, outlet type and outlet size, with the segments that have the highest and lowest median and the longest tail.
+    """)
+
+    # Item Drill-Down
+    st.write("### Item Drill-Down:")
+    st.write("""
+    - **Item-Level Rows:** Pages through individual item and outlet sales rows, sorted by sales, rating or item visibility and filtered by the slicers or an identifier search.
+    """)
     st.divider()
 
 # Analysis tab
 elif selected_menu == "Analysis":
-    overview_tab, fat_analysis_tab, outlet_analysis_tab = st.tabs(["**Overview**", "**Fat Based Analysis**", "**Outlet Based Analysis**"])
+    overview_tab, fat_analysis_tab, outlet_analysis_tab, distribution_tab, drilldown_tab = st.tabs(
+        ["**Overview**", "**Fat Based Analysis**", "**Outlet Based Analysis**", "**Distributions**",
+         "**Item Drill-Down**"])
 
     # Overview Tab
     with overview_tab:
-        # Key Metrics
-        total_sales_amount = data_frame['Sales'].sum()
-        average_sales_amount = data_frame['Sales'].mean()
-        average_rating_value = data_frame['Rating'].mean()
-        unique_items_count = data_frame['Item Identifier'].nunique()
-        unique_outlets_count = data_frame['Outlet Identifier'].nunique()
-
-        # Display metrics in columns
-        col1, col2, col3, col4, col5 = st.columns([1.5, 1, 1, 1, 1])
-        col1.metric(":blue[Total Sales]", f"${total_sales_amount:,.2f}")
-        col2.metric(":blue[Avg Sales]", f"${average_sales_amount:,.2f}")
-        col3.metric(":blue[Average Rating]", f"{average_rating_value:.1f}")
-        col4.metric(":blue[Number of Items]", unique_items_count)
-        col5.metric(":blue[Total Outlets]", unique_outlets_count)
-
-        st.divider()
-
-        # Sales by Item Type Pie Chart
-        st.subheader("Sales by Item Type")
-
-        # Grouping data by Item Type and calculating total sales and item count
-        item_sales_data = data_frame.groupby('Item Type').agg({'Sales': 'sum', 'Item Identifier': 'count'}).reset_index()
-        item_sales_data.rename(columns={'Item Identifier': 'Item Count'}, inplace=True)
-
-        # Calculate percentage of total sales
-        item_sales_data['Percentage'] = (item_sales_data['Sales'] / total_sales_amount) * 100
-
-        # Highest and lowest sales item types
-        highest_sales_item = item_sales_data.loc[item_sales_data['Percentage'].idxmax()]
-        lowest_sales_item = item_sales_data.loc[item_sales_data['Percentage'].idxmin()]
-
-        total_item_types_count = item_sales_data['Item Type'].nunique()
-
-        col1, col2 = st.columns([2, 1])
-        with col1:
-            # Creating the pie chart
-            pie_chart_item_sales = px.pie(item_sales_data, values='Sales', names='Item Type',
-                                           title='Sales Distribution by Item Type',
-                                           color_discrete_sequence=px.colors.sequential.RdBu)
-            st.plotly_chart(pie_chart_item_sales)
-
-        with col2:
-            # Highlighting key insights
-            st.markdown(f"**Out of {total_item_types_count} Total Types**")
-            st.markdown(f"**:green[Highest Sales Type:]** {highest_sales_item['Item Type']}")
-            st.markdown(f"**:green[Sales Amount:]** ${highest_sales_item['Sales']:,.2f}")
-            st.markdown(f"**:green[Percentage of Total Sales:]** {highest_sales_item['Percentage']:.2f}%")
-            st.divider()
-            st.markdown(f"**:orange[Lowest Sales Type:]** {lowest_sales_item['Item Type']}")
-            st.markdown(f"**:orange[Sales Amount:]** ${lowest_sales_item['Sales']:,.2f}")
-            st.markdown(f"**:orange[Percentage of Total Sales:]** {lowest_sales_item['Percentage']:.2f}%")
-
-        st.divider()
-
-
-        # Total Sales by Outlet Type (Pie Chart)
-        col1, col2 = st.columns([2, 1])  
-        with col1:
-            total_sales_by_outlet = data_frame.groupby('Outlet Type')['Sales'].sum().reset_index()
-            pie_chart_total_sales = px.pie(total_sales_by_outlet, values='Sales', names='Outlet Type',
-                                        title="Total Sales by Outlet Type",
-                                        color_discrete_sequence=px.colors.sequential.RdBu, hole=0.7)
-            st.plotly_chart(pie_chart_total_sales)
-        with col2:
-            total_sales = total_sales_by_outlet['Sales'].sum()
-            highest_sales_outlet = total_sales_by_outlet.loc[total_sales_by_outlet['Sales'].idxmax()]
-            lowest_sales_outlet = total_sales_by_outlet.loc[total_sales_by_outlet['Sales'].idxmin()]
-
-            st.write("")
-            st.write("")
-            st.write("")
-            st.write("")
-            st.write("")
-            st.write("")
-            st.write("")
-            st.write("")
-            st.subheader(":blue[Key Insights]")
-            st.markdown(f"**Total Sales:** ${total_sales:,.2f}")
-            st.markdown(f"**:green[Highest Sales Outlet Type:]** {highest_sales_outlet['Outlet Type']} - ${highest_sales_outlet['Sales']:,.2f}")
-            st.markdown(f"**:orange[Lowest Sales Outlet Type:]** {lowest_sales_outlet['Outlet Type']} - ${lowest_sales_outlet['Sales']:,.2f}")
-
-        st.divider()
-
-        # Sales by Outlet Location Type (Horizontal Bar Chart)
-        col1, col2 = st.columns([2, 1])
-        with col1:
-            sales_by_location_type = data_frame.groupby('Outlet Location Type')['Sales'].sum().reset_index().sort_values(by='Sales', ascending=True)
-            bar_chart_sales_by_location = px.bar(sales_by_location_type, x='Sales', y='Outlet Location Type', orientation='h',
-                                                title="Sales by Outlet Location Type", color='Sales',
-                                                color_continuous_scale='greens')
-            st.plotly_chart(bar_chart_sales_by_location)
-        with col2:
-            highest_sales_location = sales_by_location_type.loc[sales_by_location_type['Sales'].idxmax()]
-            lowest_sales_location = sales_by_location_type.loc[sales_by_location_type['Sales'].idxmin()]
-
-            # Displaying key insights
-            st.write("")
-            st.write("")
-            st.write("")
-            st.write("")
-            st.write("")
-            st.write("")
-            st.write("")
-            st.write("")
-            st.write("")
-            st.write("")
-            st.subheader(":blue[Key Insights]")
-            st.markdown(f"**:green[Highest Sales Location:]** {highest_sales_location['Outlet Location Type']} - ${highest_sales_location['Sales']:,.2f}")
-            st.markdown(f"**:orange[Lowest Sales Location:]** {lowest_sales_location['Outlet Location Type']} - ${lowest_sales_location['Sales']:,.2f}")
-
-        st.divider()
-
-        # Item Visibility by Item Type (Bar Chart)
-        col1, col2 = st.columns([2, 1])
-        with col1:
-            # Calculate the average visibility for each item type
-            avg_visibility_by_item_type = data_frame.groupby('Item Type')['Item Visibility'].mean().reset_index()
-            avg_visibility_by_item_type = avg_visibility_by_item_type.sort_values(by='Item Visibility')
-
-            # Creating the bar chart
-            bar_chart_visibility = px.bar(avg_visibility_by_item_type, 
-                                        x='Item Visibility', 
-                                        y='Item Type', 
-                                        orientation='h',
-                                        title="Average Item Visibility by Item Type", 
-                                        color='Item Visibility',
-                                        color_continuous_scale='ylgn')  # Using a color scale
-            st.plotly_chart(bar_chart_visibility)
-
-        with col2:
-            highest_avg_visibility_type = avg_visibility_by_item_type.loc[avg_visibility_by_item_type['Item Visibility'].idxmax()]
-            lowest_avg_visibility_type = avg_visibility_by_item_type.loc[avg_visibility_by_item_type['Item Visibility'].idxmin()]
-
-            # Displaying key insights
-            st.write("")
-            st.write("")
-            st.write("")
-            st.write("")
-            st.write("")
-            st.write("")
-            st.write("")
-            st.write("")
-            st.subheader(":blue[Key Insights]")
-            st.markdown(f"**:green[Highest Average Visibility Item Type:]** {highest_avg_visibility_type['Item Type']} - {highest_avg_visibility_type['Item Visibility']:.2f}")
-            st.markdown(f"**:orange[Lowest Average Visibility Item Type:]** {lowest_avg_visibility_type['Item Type']} - {lowest_avg_visibility_type['Item Visibility']:.2f}")
-
-        st.divider()
+        render_overview_tab()
 
     # Fat-Based Analysis Tab
     with fat_analysis_tab:
-        st.header("Fat Based Analysis")
-
-        # Metric Selector
-        selected_metric = st.selectbox("Select Metric to Visualize:", ["Total Sales", "Average Sales"])
-        st.divider()
-        # Calculate Sales Based on Selected Metric
-        if selected_metric == "Total Sales":
-            fat_content_sales_data = data_frame.groupby('Item Fat Content')['Sales'].sum().reset_index()
-            sales_by_outlet_and_fat_data = data_frame.groupby(['Outlet Location Type', 'Item Fat Content'])['Sales'].sum().reset_index()
-            sales_by_item_type_data = data_frame.groupby('Item Type')['Sales'].sum().reset_index().sort_values(by='Sales', ascending=True)
-        else:  # Average Sales
-            fat_content_sales_data = data_frame.groupby('Item Fat Content')['Sales'].mean().reset_index()
-            sales_by_outlet_and_fat_data = data_frame.groupby(['Outlet Location Type', 'Item Fat Content'])['Sales'].mean().reset_index()
-            sales_by_item_type_data = data_frame.groupby('Item Type')['Sales'].mean().reset_index().sort_values(by='Sales', ascending=True)
-
-        # Define color palette
-        custom_color_palette = ['#CDA900', '#568949']  # Yellow and Green
-
-        # Fat Content Sales Pie Chart
-        col1, col2 = st.columns([2, 1])  # Create two columns for the pie chart and insights
-        with col1:
-            pie_chart_fat_sales = px.pie(fat_content_sales_data, values='Sales', names='Item Fat Content',
-                                        title=f"{selected_metric} Distribution by Item Fat Content",
-                                        color_discrete_sequence=custom_color_palette, hole=0.7)
-            st.plotly_chart(pie_chart_fat_sales)
-        with col2:
-            total_fat_sales = fat_content_sales_data['Sales'].sum()
-            highest_fat_sales = fat_content_sales_data.loc[fat_content_sales_data['Sales'].idxmax()]
-            lowest_fat_sales = fat_content_sales_data.loc[fat_content_sales_data['Sales'].idxmin()]
-
-            st.write("")
-            st.write("")
-            st.write("")
-            st.write("")
-            st.write("")
-            st.write("")
-            st.write("")
-            st.write("")
-            st.subheader(":blue[Key Insights]")
-            st.markdown(f"**Total Sales by Fat Content:** ${total_fat_sales:,.2f}")
-            st.markdown(f"**:green[Highest Fat Content Sales:]** {highest_fat_sales['Item Fat Content']} - ${highest_fat_sales['Sales']:,.2f}")
-            st.markdown(f"**:orange[Lowest Fat Content Sales:]** {lowest_fat_sales['Item Fat Content']} - ${lowest_fat_sales['Sales']:,.2f}")
-
-        st.divider()
-
-        # Fat Content by Outlet Location Type Bar Chart
-        col1, col2 = st.columns([2, 1])  
-        with col1:
-            bar_chart_fat_outlet = px.bar(sales_by_outlet_and_fat_data, x='Sales', y='Outlet Location Type',
-                                        color='Item Fat Content', barmode='group', orientation='h',
-                                        title=f"{selected_metric} by Outlet Location Type and Fat Content",
-                                        color_discrete_sequence=custom_color_palette)
-            st.plotly_chart(bar_chart_fat_outlet)
-        with col2:
-            highest_outlet_fat_sales = sales_by_outlet_and_fat_data.loc[sales_by_outlet_and_fat_data['Sales'].idxmax()]
-            lowest_outlet_fat_sales = sales_by_outlet_and_fat_data.loc[sales_by_outlet_and_fat_data['Sales'].idxmin()]
-
-            st.write("")
-            st.write("")
-            st.write("")
-            st.write("")
-            st.write("")
-            st.write("")
-            st.write("")
-            st.write("")
-            st.write("")
-            st.subheader(":blue[Key Insights]")
-            st.markdown(f"**:green[Highest Outlet Sales for Fat Content:]** {highest_outlet_fat_sales['Outlet Location Type']} - ${highest_outlet_fat_sales['Sales']:,.2f}")
-            st.markdown(f"**:orange[Lowest Outlet Sales for Fat Content:]** {lowest_outlet_fat_sales['Outlet Location Type']} - ${lowest_outlet_fat_sales['Sales']:,.2f}")
-
-        st.divider()
-
-        # Item Type Horizontal Bar Chart
-        bar_chart_item_sales = px.bar(sales_by_item_type_data, x='Sales', y='Item Type', orientation='h',
-                                    title=f"{selected_metric} by Item Type", color='Sales',color_continuous_scale='ylgn',
-                                    height=600)
-        
-        st.plotly_chart(bar_chart_item_sales)
-        st.divider()
+        render_fat_analysis_tab()
 
     # Outlet-Based Analysis Tab
     with outlet_analysis_tab:
-        st.header("Outlet-Based Analysis")
+        render_outlet_analysis_tab()
 
-        st.divider()
-
-        # Sales by Outlet Establishment Year
-        sales_by_year_data = data_frame.groupby('Outlet Establishment Year')['Sales'].sum().reset_index()
-
-        # Creating a smooth line chart with filled area
-        line_chart_sales_by_year = px.line(sales_by_year_data,
-                                            x='Outlet Establishment Year',
-                                            y='Sales',
-                                            title='Sales by Outlet Establishment Year',
-                                            line_shape='spline',  # Makes the line smooth
-                                            markers=True)         # Adds markers for each data point
-
-        # Update the trace to have white line and markers with darker yellow filled area
-        line_chart_sales_by_year.update_traces(
-            line=dict(color='white'),         # Line color white
-            marker=dict(color='white'),       # Marker color white
-            fill='tozeroy',                   # Fills the area from the line to the x-axis
-            fillcolor='rgba(255, 204, 0, 0.8)'  # Darker yellow with less transparency
-        )
-
-        # Show the plot
-        col1, col2 = st.columns([2, 1])
-        with col1:
-            st.plotly_chart(line_chart_sales_by_year)
-        with col2:
-            # Key insights for the line chart
-            total_sales_by_year = sales_by_year_data['Sales'].sum()
-            latest_year_sales = sales_by_year_data.iloc[-1]['Sales']
-            growth_rate = ((latest_year_sales - sales_by_year_data.iloc[0]['Sales']) / sales_by_year_data.iloc[0]['Sales']) * 100
-
-            st.write("")
-            st.write("")
-            st.write("")
-            st.write("")
-            st.write("")
-            st.write("")
-            st.write("")
-            st.write("")
-            st.subheader(":blue[Key Insights]")
-            st.markdown(f"**Total Sales:** ${total_sales_by_year:,.2f}")
-            st.markdown(f"**:orange[Sales in Latest Year:]** ${latest_year_sales:,.2f}")
-            st.markdown(f"**:green[Growth Rate:]** {growth_rate:.2f}%")
-
-        st.divider()
-
-        # Sales by Outlet Location Type
-        outlet_location_sales_data = data_frame.groupby('Outlet Location Type')['Sales'].sum().reset_index()
-
-        # Custom colors
-        custom_color_palette_outlet = ['#FFD700', '#FFFFE0', '#568949']
-
-        bar_chart_outlet_location = px.bar(outlet_location_sales_data,
-                                            x='Outlet Location Type',
-                                            y='Sales',
-                                            title="Sales by Outlet Location Type",
-                                            color='Outlet Location Type',
-                                            color_discrete_sequence=custom_color_palette_outlet)
-
-        col1, col2 = st.columns([2, 1]) 
-        with col1:
-            st.plotly_chart(bar_chart_outlet_location)
-        with col2:
-            # Key insights for the bar chart
-            highest_sales_outlet = outlet_location_sales_data.loc[outlet_location_sales_data['Sales'].idxmax()]
-            lowest_sales_outlet = outlet_location_sales_data.loc[outlet_location_sales_data['Sales'].idxmin()]
-
-            st.write("")
-            st.write("")
-            st.write("")
-            st.write("")
-            st.write("")
-            st.write("")
-            st.write("")
-            st.write("")
-            st.write("")
-            st.subheader(":blue[Key Insights]")
-            st.markdown(f"**:green[Highest Sales Outlet Type:]** {highest_sales_outlet['Outlet Location Type']} - ${highest_sales_outlet['Sales']:,.2f}")
-            st.markdown(f"**:orange[Lowest Sales Outlet Type:]** {lowest_sales_outlet['Outlet Location Type']} - ${lowest_sales_outlet['Sales']:,.2f}")
+    # Distributions Tab
+    with distribution_tab:
+        render_distribution_tab()
 
-        st.divider()
-
-        # Sales by Outlet Size (Donut Chart)
-        outlet_size_sales_data = data_frame.groupby('Outlet Size')['Sales'].sum().reset_index()
-
-        # Creating a donut chart
-        donut_chart_outlet_size = px.pie(outlet_size_sales_data,
-                                        values='Sales',
-                                        names='Outlet Size',
-                                        title="Sales by Outlet Size",
-                                        hole=0.7,
-                                        color_discrete_sequence=custom_color_palette_outlet)
-
-        col1, col2 = st.columns([2, 1])  # Create two columns
-        with col1:
-            st.plotly_chart(donut_chart_outlet_size)
-        with col2:
-            # Key insights for the donut chart
-            total_sales_by_size = outlet_size_sales_data['Sales'].sum()
-            sales_by_high = outlet_size_sales_data.loc[outlet_size_sales_data['Outlet Size'] == 'High', 'Sales'].values[0] if 'High' in outlet_size_sales_data['Outlet Size'].values else 0
-            sales_by_small = outlet_size_sales_data.loc[outlet_size_sales_data['Outlet Size'] == 'Small', 'Sales'].values[0] if 'Small' in outlet_size_sales_data['Outlet Size'].values else 0
-            sales_by_medium = outlet_size_sales_data.loc[outlet_size_sales_data['Outlet Size'] == 'Medium', 'Sales'].values[0] if 'Medium' in outlet_size_sales_data['Outlet Size'].values else 0
-        
-            st.write("")
-            st.write("")
-            st.write("")
-            st.write("")
-            st.write("")
-            st.write("")
-            st.write("")
-            st.subheader(":blue[Key Insights]")
-            st.markdown(f"**Sales by High Outlets:** ${sales_by_high:,.2f}")
-            st.markdown(f"**Sales by Small Outlets:** ${sales_by_small:,.2f}")
-            st.markdown(f"**Sales by Medium Outlets:** ${sales_by_medium:,.2f}")
-
-        st.divider()
-
-        # Grouping data by 'Outlet Type' and calculating the required metrics
-        outlet_metrics_data = data_frame.groupby('Outlet Type').agg(
-            Total_Sales=('Sales', 'sum'),
-            Number_of_Items=('Item Identifier', 'nunique'),
-            Average_Sales=('Sales', 'mean'),
-            Average_Rating=('Rating', 'mean'),
-            Average_Item_Visibility=('Item Visibility', 'mean')
-        ).reset_index()
-
-        # Rename columns for better readability
-        outlet_metrics_data.columns = ['Outlet Type', 'Total Sales', 'No. of Items', 'Avg Sales', 'Avg Rating', 'Avg Item Visibility']
-
-        # Display the metrics table in Streamlit
-        st.subheader("Outlet Type Metrics Table")
-        st.dataframe(outlet_metrics_data.style.format({
-            'Total Sales': '${:,.2f}',  # Format as currency with 2 decimal places
-            'Avg Sales': '${:,.2f}',    # Format as currency with 2 decimal places
-            'Avg Rating': '{:.2f}',     # Format as rating with 2 decimal places
-            'Avg Item Visibility': '{:.2f}'  # Format item visibility with 2 decimal places
-        }))
-
-        st.divider()
+    # Item Drill-Down Tab
+    with drilldown_tab:
+        render_drilldown_tab()
 
 elif selected_menu == "About":
     st.divider()
@@ -451,7 +795,7 @@ elif selected_menu == "About":
     # Interactive Features
     st.subheader(":blue[Interactive Features]")
     st.write("""
-    - **Slicers and Selectors:** Users can interactively choose metrics for visualization.
+    - **Slicers and Selectors:** Users can filter every panel by outlet location type, outlet size, outlet type, fat content, item type and establishment year, and choose metrics for visualization.
     - **Dynamic Charts:** The app dynamically updates visualizations based on user selections.
     """)
 
@@ -470,3 +814,7 @@ elif selected_menu == "About":
 
     # Path to the Power BI dashboard image
     st.image("Blinkit_PowerBI_Dashboard.png", caption="Power BI Dashboard Overview")
+
+# Profiling debug panel, after every stage of this run has been recorded
+if PROFILING_ENABLED:
+    render_profiling_panel()
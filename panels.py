@@ -0,0 +1,177 @@
+"""Data and Key Insights for each Analysis panel, computed from a SalesCube.
+
+Every panel is a pure function of the cube (plus its own options), so panels
+can be cached and computed independently of each other and of Streamlit.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from distributions import DISTRIBUTION_MEASURES
+
+
+def _extremes(data, column):
+    return data.loc[data[column].idxmax()], data.loc[data[column].idxmin()]
+
+
+# Overview tab
+def key_metrics(cube):
+    return cube.kpis()
+
+
+def item_type_sales(cube):
+    data = cube.rollup('Item Type', ['Sales', 'Count']).rename(columns={'Count': 'Item Count'})
+    data['Percentage'] = (data['Sales'] / cube.total('Sales')) * 100
+    highest, lowest = _extremes(data, 'Percentage')
+    return {'data': data, 'highest': highest, 'lowest': lowest,
+            'type_count': data['Item Type'].nunique()}
+
+
+def outlet_type_sales(cube):
+    data = cube.rollup('Outlet Type')
+    highest, lowest = _extremes(data, 'Sales')
+    return {'data': data, 'highest': highest, 'lowest': lowest, 'total': data['Sales'].sum()}
+
+
+def location_type_sales(cube):
+    data = cube.rollup('Outlet Location Type').sort_values(by='Sales', ascending=True)
+    highest, lowest = _extremes(data, 'Sales')
+    return {'data': data, 'highest': highest, 'lowest': lowest}
+
+
+def item_visibility(cube):
+    data = cube.rollup('Item Type', 'Item Visibility', how='mean').sort_values(by='Item Visibility')
+    highest, lowest = _extremes(data, 'Item Visibility')
+    return {'data': data, 'highest': highest, 'lowest': lowest}
+
+
+# Fat Based tab; `how` is 'sum' for Total Sales and 'mean' for Average Sales
+def fat_content_sales(cube, how='sum'):
+    data = cube.rollup('Item Fat Content', how=how)
+    highest, lowest = _extremes(data, 'Sales')
+    return {'data': data, 'highest': highest, 'lowest': lowest, 'total': data['Sales'].sum()}
+
+
+def location_fat_sales(cube, how='sum'):
+    data = cube.rollup(['Outlet Location Type', 'Item Fat Content'], how=how)
+    highest, lowest = _extremes(data, 'Sales')
+    return {'data': data, 'highest': highest, 'lowest': lowest}
+
+
+def item_type_metric_sales(cube, how='sum'):
+    return {'data': cube.rollup('Item Type', how=how).sort_values(by='Sales', ascending=True)}
+
+
+# Outlet Based tab
+def sales_by_year(cube):
+    data = cube.rollup('Outlet Establishment Year')
+    first_year_sales = data.iloc[0]['Sales']
+    latest_year_sales = data.iloc[-1]['Sales']
+    return {'data': data, 'total': data['Sales'].sum(), 'latest': latest_year_sales,
+            'growth_rate': ((latest_year_sales - first_year_sales) / first_year_sales) * 100}
+
+
+def outlet_location_sales(cube):
+    data = cube.rollup('Outlet Location Type')
+    highest, lowest = _extremes(data, 'Sales')
+    return {'data': data, 'highest': highest, 'lowest': lowest}
+
+
+def outlet_size_sales(cube):
+    data = cube.rollup('Outlet Size')
+    sales_by_size = dict(zip(data['Outlet Size'], data['Sales']))
+    return {'data': data, 'total': data['Sales'].sum(),
+            'high': sales_by_size.get('High', 0),
+            'small': sales_by_size.get('Small', 0),
+            'medium': sales_by_size.get('Medium', 0)}
+
+
+def outlet_metrics(cube):
+    data = cube.outlet_metrics()
+    data.columns = ['Outlet Type', 'Total Sales', 'No. of Items', 'Avg Sales', 'Avg Rating', 'Avg Item Visibility']
+    return {'data': data}
+
+
+# Distributions tab; `measure` is one of DISTRIBUTION_MEASURES
+def _segment_distribution(cube, dimension, measure):
+    data = cube.quantiles(dimension, measure)
+    highest, lowest = _extremes(data, 'Median')
+    longest_tail = data.loc[(data['P99'] - data['Median']).idxmax()]
+    return {'data': data, 'histogram': cube.histogram(dimension, measure), 'dimension': dimension,
+            'highest': highest, 'lowest': lowest, 'longest_tail': longest_tail}
+
+
+def item_type_distribution(cube, measure='Sales'):
+    return _segment_distribution(cube, 'Item Type', measure)
+
+
+def outlet_type_distribution(cube, measure='Sales'):
+    return _segment_distribution(cube, 'Outlet Type', measure)
+
+
+def outlet_size_distribution(cube, measure='Sales'):
+    return _segment_distribution(cube, 'Outlet Size', measure)
+
+
+OVERVIEW_PANELS = {
+    'key_metrics': key_metrics,
+    'item_type_sales': item_type_sales,
+    'outlet_type_sales': outlet_type_sales,
+    'location_type_sales': location_type_sales,
+    'item_visibility': item_visibility,
+}
+
+FAT_PANELS = {
+    'fat_content_sales': fat_content_sales,
+    'location_fat_sales': location_fat_sales,
+    'item_type_metric_sales': item_type_metric_sales,
+}
+
+OUTLET_PANELS = {
+    'sales_by_year': sales_by_year,
+    'outlet_location_sales': outlet_location_sales,
+    'outlet_size_sales': outlet_size_sales,
+    'outlet_metrics': outlet_metrics,
+}
+
+DISTRIBUTION_PANELS = {
+    'item_type_distribution': item_type_distribution,
+    'outlet_type_distribution': outlet_type_distribution,
+    'outlet_size_distribution': outlet_size_distribution,
+}
+
+# Fat Based tab metric selector label -> roll-up
+FAT_METRICS = {
+    'Total Sales': 'sum',
+    'Average Sales': 'mean',
+}
+
+TAB_PANELS = {
+    'overview': OVERVIEW_PANELS,
+    'fat': FAT_PANELS,
+    'outlet': OUTLET_PANELS,
+    'distribution': DISTRIBUTION_PANELS,
+}
+
+
+def fat_tab_key(metric_label):
+    return 'fat_' + metric_label.lower().replace(' ', '_')
+
+
+def distribution_tab_key(measure):
+    return 'distribution_' + measure.lower().replace(' ', '_')
+
+
+def dashboard_tabs():
+    """Yield (tab key, panels, options) for every view of the Analysis page."""
+    yield 'overview', OVERVIEW_PANELS, {}
+    for metric_label, how in FAT_METRICS.items():
+        yield fat_tab_key(metric_label), FAT_PANELS, {'how': how}
+    yield 'outlet', OUTLET_PANELS, {}
+    for measure in DISTRIBUTION_MEASURES:
+        yield distribution_tab_key(measure), DISTRIBUTION_PANELS, {'measure': measure}
+
+
+def compute_panels(cube, panels, max_workers=None, **options):
+    """Compute several panels concurrently; `options` are passed to every panel."""
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {name: executor.submit(panel, cube, **options) for name, panel in panels.items()}
+        return {name: future.result() for name, future in futures.items()}
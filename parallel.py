@@ -0,0 +1,94 @@
+"""Parallel aggregation of partitioned sales shards on a process pool.
+
+Sales may be stored as many CSV shards (for example one per outlet and day).
+Each worker process aggregates one shard into a partial SalesCube and the
+coordinator folds the partials, as they complete, into the cube the dashboard
+tabs consume.
+
+The pool runs in a coordinator process started as `python parallel.py`.
+Forkserver and spawn workers re-run the parent's __main__ module, which inside
+Streamlit is the dashboard script; the coordinator's __main__ is this module,
+so its workers only import what aggregation needs.
+"""
+import multiprocessing
+import os
+import pickle
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from aggregates import build_cube
+from data_loader import read_dataset
+from streaming import fold_cubes
+
+# Below this many bytes in total, process start-up costs more than it saves
+MIN_PARALLEL_BYTES = 32 * 1024 ** 2
+
+# Workers start from a clean process rather than a fork of one that may hold
+# locks or threads, such as the pool's own management thread
+POOL_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+
+def discover_shards(root, pattern='**/*.csv'):
+    return sorted(str(path) for path in Path(root).glob(pattern) if path.is_file())
+
+
+def shards_signature(shard_paths):
+    """Return a hashable value that changes when any shard is added, removed or rewritten."""
+    signature = []
+    for path in shard_paths:
+        stat = os.stat(path)
+        signature.append((path, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def aggregate_shard(path, distinct_error=None):
+    data_frame, _ = read_dataset(path)
+    return build_cube(data_frame, distinct_error)
+
+
+def aggregate_shards(paths, distinct_error=None):
+    """Aggregate a group of shards in one worker and return their merged cube."""
+    return fold_cubes(aggregate_shard(path, distinct_error) for path in paths)
+
+
+def parallel_cube(shard_paths, workers=None, min_parallel_bytes=MIN_PARALLEL_BYTES, distinct_error=None):
+    """Aggregate every shard and fold the partial cubes together.
+
+    `workers` defaults to the number of CPUs. Small inputs, a single shard or
+    `workers=1` are aggregated serially in the calling process.
+    """
+    shard_paths = list(shard_paths)
+    if not shard_paths:
+        raise ValueError("No shards to aggregate")
+    workers = min(workers or os.cpu_count() or 1, len(shard_paths))
+    total_bytes = sum(os.path.getsize(path) for path in shard_paths)
+
+    if workers == 1 or total_bytes < min_parallel_bytes:
+        return aggregate_shards(shard_paths, distinct_error)
+
+    group_size = max(1, len(shard_paths) // (workers * 4))
+    groups = [shard_paths[start:start + group_size] for start in range(0, len(shard_paths), group_size)]
+    coordinator = subprocess.run([sys.executable, os.path.abspath(__file__)],
+                                 input=pickle.dumps((groups, workers, distinct_error)), capture_output=True)
+    if coordinator.returncode:
+        errors = coordinator.stderr.decode(errors='replace').strip().splitlines()
+        raise RuntimeError(f"Shard aggregation failed: {errors[-1] if errors else coordinator.returncode}")
+    return pickle.loads(coordinator.stdout)
+
+
+def pool_cube(groups, workers, distinct_error=None):
+    """Aggregate each group of shards on a process pool and fold the partial cubes."""
+    with ProcessPoolExecutor(max_workers=workers,
+                             mp_context=multiprocessing.get_context(POOL_START_METHOD)) as executor:
+        # as_completed drops each future once yielded, so only the running total and
+        # the partials not yet folded are held
+        return fold_cubes(future.result() for future in as_completed(
+            {executor.submit(aggregate_shards, group, distinct_error) for group in groups}))
+
+
+if __name__ == '__main__':
+    # Coordinator process: (groups, workers, distinct_error) in on stdin, the cube out on stdout
+    groups, workers, distinct_error = pickle.load(sys.stdin.buffer)
+    pickle.dump(pool_cube(groups, workers, distinct_error), sys.stdout.buffer)
@@ -0,0 +1,167 @@
+"""Opt-in per-stage profiling for the dashboard.
+
+A run is one execution of the page or of a tab fragment. Each stage inside a
+run (load, aggregate, compute, figure, render) records wall time, CPU time of
+the executing thread and net memory allocated. Allocations come from the
+process-wide tracemalloc counter, so they are only attributed correctly to
+stages that do not overlap; PROFILED_PANEL_WORKERS keeps the panels of a run
+from overlapping. Completed stages are added to
+process-wide totals that can be exported as Prometheus text or logged as JSON
+lines. When profiling is disabled, runs and stages are shared no-op objects.
+"""
+import contextlib
+import itertools
+import json
+import logging
+import threading
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger('blinkit.profiling')
+
+# Panels are computed one at a time while profiling, so that each panel's
+# allocations are not mixed with those of the panels running beside it
+PROFILED_PANEL_WORKERS = 1
+
+
+@dataclass(frozen=True)
+class StageRecord:
+    run_id: int
+    run_label: str
+    stage: str
+    panel: str
+    wall_seconds: float
+    cpu_seconds: float
+    allocated_bytes: int
+
+
+class RunProfile:
+    def __init__(self, profiler, run_id, label):
+        self.profiler = profiler
+        self.run_id = run_id
+        self.label = label
+        self.started_at = time.time()
+        self.records = []
+
+    @contextlib.contextmanager
+    def stage(self, stage, panel=''):
+        allocated_before = tracemalloc.get_traced_memory()[0]
+        cpu_started = time.thread_time()
+        wall_started = time.perf_counter()
+        try:
+            yield
+        finally:
+            record = StageRecord(
+                run_id=self.run_id,
+                run_label=self.label,
+                stage=stage,
+                panel=panel,
+                wall_seconds=time.perf_counter() - wall_started,
+                cpu_seconds=time.thread_time() - cpu_started,
+                allocated_bytes=tracemalloc.get_traced_memory()[0] - allocated_before,
+            )
+            self.records.append(record)
+            self.profiler.add(record)
+
+
+class _DisabledRun:
+    run_id = None
+    label = ''
+    records = ()
+
+    def stage(self, stage, panel=''):
+        return _DISABLED_STAGE
+
+
+_DISABLED_STAGE = contextlib.nullcontext()
+_DISABLED_RUN = _DisabledRun()
+
+
+def profiled(run, stage, panel, func):
+    """Wrap `func` so that every call is recorded as `stage` of `panel` in `run`."""
+    def wrapper(*args, **kwargs):
+        with run.stage(stage, panel):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+class Profiler:
+    def __init__(self, enabled=False, log_records=False):
+        self.enabled = enabled
+        self.log_records = log_records
+        # (stage, panel) -> [count, wall seconds, cpu seconds, allocated bytes]
+        self.totals = {}
+        # Callables returning extra Prometheus text, such as cache counters
+        self.collectors = []
+        self._run_ids = itertools.count(1)
+        self._lock = threading.Lock()
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if log_records and not logger.handlers:
+            logger.addHandler(logging.StreamHandler())
+            logger.setLevel(logging.INFO)
+
+    def new_run(self, label):
+        if not self.enabled:
+            return _DISABLED_RUN
+        return RunProfile(self, next(self._run_ids), label)
+
+    def add(self, record):
+        with self._lock:
+            totals = self.totals.setdefault((record.stage, record.panel), [0, 0.0, 0.0, 0])
+            totals[0] += 1
+            totals[1] += record.wall_seconds
+            totals[2] += record.cpu_seconds
+            totals[3] += max(record.allocated_bytes, 0)
+        if self.log_records:
+            logger.info(json.dumps(asdict(record)))
+
+    def to_prometheus(self):
+        with self._lock:
+            totals = sorted(self.totals.items())
+        metrics = [
+            ('blinkit_stage_runs_total', "Number of times each dashboard stage ran.", 0),
+            ('blinkit_stage_wall_seconds_total', "Wall time spent in each dashboard stage.", 1),
+            ('blinkit_stage_cpu_seconds_total', "CPU time spent in each dashboard stage.", 2),
+            ('blinkit_stage_allocated_bytes_total', "Memory allocated by each dashboard stage.", 3),
+        ]
+        lines = []
+        for name, help_text, position in metrics:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for (stage, panel), values in totals:
+                lines.append(f'{name}{{stage="{stage}",panel="{panel}"}} {values[position]}')
+        return "\n".join(lines) + "\n" + "".join(collector() for collector in self.collectors)
+
+
+def serve_metrics(profiler, port, host='127.0.0.1'):
+    """Serve profiler.to_prometheus() at http://host:port/metrics from a daemon thread.
+
+    Returns the server, or None if the port cannot be bound (e.g. another server
+    process on the host already serves it); profiling carries on without it.
+    """
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != '/metrics':
+                self.send_error(404)
+                return
+            body = profiler.to_prometheus().encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    try:
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+    except OSError as error:
+        logger.warning("Not serving metrics on %s:%s: %s", host, port, error)
+        return None
+    threading.Thread(target=server.serve_forever, name='blinkit-metrics', daemon=True).start()
+    return server
@@ -0,0 +1,156 @@
+"""Memory-mapped Arrow store shared by every dashboard server process.
+
+The first process to need a dataset version materializes it once as
+uncompressed Arrow IPC files: the rows, the SalesCube cells, the cube's
+distinct item and outlet counters and its segment distributions. Every process then maps those files
+read-only. Numeric columns become zero-copy views of the mapped pages, which
+the operating system shares between processes, so adding workers adds little
+memory, and a new worker skips parsing and aggregating.
+"""
+import glob
+import hashlib
+import os
+import time
+
+import numpy as np
+import pyarrow as pa
+
+from aggregates import SalesCube, build_cube
+from data_loader import LoadStats, read_dataset
+from distributions import Distribution, QuantileSketch
+from sketches import HyperLogLog
+
+STORE_DIR = os.path.join(".blinkit_cache", "shared")
+
+# Owner of the outlet identifiers in the distinct table; every other owner is an Outlet Type
+OUTLETS_OWNER = ''
+
+
+def _digest(value):
+    return hashlib.blake2b(repr(value).encode(), digest_size=8).hexdigest()
+
+
+def store_key(signature, distinct_error=None):
+    """Return '<lineage>-<version>' for the dataset at signature[0] and distinct count mode.
+
+    The lineage names the dataset file and mode; the version changes whenever the file does.
+    """
+    return f'{_digest((signature[0], distinct_error))}-{_digest((signature, distinct_error))}'
+
+
+def store_paths(key, store_dir=STORE_DIR):
+    return {name: os.path.join(store_dir, f'{name}-{key}.arrow') for name in ('rows', 'cells', 'distinct', 'distributions')}
+
+
+def write_table(table, path):
+    temporary_path = f'{path}.{os.getpid()}.tmp'
+    with pa.OSFile(temporary_path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(temporary_path, path)
+
+
+def map_table(path):
+    with pa.memory_map(path, 'r') as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+def _distinct_table(cube):
+    owners = [(outlet_type, ids) for outlet_type, ids in cube.items_by_outlet_type.items()]
+    owners.append((OUTLETS_OWNER, cube.outlet_ids))
+    if cube.distinct_precision is not None:
+        return pa.table({'owner': [owner for owner, _ in owners],
+                         'sketch': pa.array([sketch.to_bytes() for _, sketch in owners], pa.binary())})
+    return pa.table({'owner': [owner for owner, ids in owners for _ in ids],
+                     'id': [str(value) for _, ids in owners for value in ids]})
+
+
+def _distributions_table(cube):
+    keys = list(cube.distributions)
+    distributions = [cube.distributions[key] for key in keys]
+    return pa.table({
+        'dimension': [dimension for dimension, _, _ in keys],
+        'segment': [segment for _, segment, _ in keys],
+        'measure': [measure for _, _, measure in keys],
+        'compression': [distribution.sketch.compression for distribution in distributions],
+        'minimum': [distribution.sketch.minimum for distribution in distributions],
+        'maximum': [distribution.sketch.maximum for distribution in distributions],
+        'means': pa.array([distribution.sketch.means for distribution in distributions], pa.list_(pa.float64())),
+        'weights': pa.array([distribution.sketch.weights for distribution in distributions], pa.list_(pa.float64())),
+        'counts': pa.array([distribution.counts for distribution in distributions], pa.list_(pa.int64())),
+    })
+
+
+def _distributions_from_table(table):
+    distributions = {}
+    for row in table.to_pylist():
+        sketch = QuantileSketch(row['compression'], np.array(row['means']), np.array(row['weights']),
+                                row['minimum'], row['maximum'])
+        distributions[(row['dimension'], row['segment'], row['measure'])] = Distribution(
+            row['measure'], sketch, np.array(row['counts'], dtype=np.int64))
+    return distributions
+
+
+def _cube_from_tables(cells, distinct, distributions):
+    items_by_outlet_type = {}
+    outlet_ids = None
+    precision = None
+    if 'sketch' in distinct.column_names:
+        for owner, sketch in zip(distinct['owner'].to_pylist(), distinct['sketch'].to_pylist()):
+            sketch = HyperLogLog.from_bytes(sketch)
+            precision = sketch.precision
+            if owner == OUTLETS_OWNER:
+                outlet_ids = sketch
+            else:
+                items_by_outlet_type[owner] = sketch
+    else:
+        outlet_ids = set()
+        for owner, value in zip(distinct['owner'].to_pylist(), distinct['id'].to_pylist()):
+            if owner == OUTLETS_OWNER:
+                outlet_ids.add(value)
+            else:
+                items_by_outlet_type.setdefault(owner, set()).add(value)
+    return SalesCube(cells=cells.to_pandas(), items_by_outlet_type=items_by_outlet_type,
+                     outlet_ids=outlet_ids, distinct_precision=precision,
+                     distributions=_distributions_from_table(distributions))
+
+
+def materialize(signature, store_dir=STORE_DIR, distinct_error=None):
+    """Write the store for the dataset at signature[0] unless it already exists; return its paths."""
+    key = store_key(signature, distinct_error)
+    paths = store_paths(key, store_dir)
+    if all(os.path.exists(path) for path in paths.values()):
+        return paths
+
+    data_frame, _ = read_dataset(signature[0])
+    cube = build_cube(data_frame, distinct_error)
+    os.makedirs(store_dir, exist_ok=True)
+    write_table(pa.Table.from_pandas(cube.cells, preserve_index=False), paths['cells'])
+    write_table(_distinct_table(cube), paths['distinct'])
+    write_table(_distributions_table(cube), paths['distributions'])
+    write_table(pa.Table.from_pandas(data_frame, preserve_index=False), paths['rows'])
+
+    # Earlier versions of the same lineage; stores of other datasets or distinct count
+    # modes may still be opened by other processes. A process still mapping one keeps its pages
+    lineage = key.split('-')[0]
+    for stale_path in glob.glob(os.path.join(glob.escape(store_dir), f'*-{lineage}-*.arrow')):
+        if stale_path not in paths.values():
+            try:
+                os.remove(stale_path)
+            except OSError:
+                pass
+    return paths
+
+
+def open_dataset(paths):
+    """Return (data_frame, stats) backed by the mapped rows file."""
+    started = time.perf_counter()
+    # One block per column lets numeric columns stay views of the mapped buffers
+    data_frame = map_table(paths['rows']).to_pandas(split_blocks=True)
+    stats = LoadStats(rows=len(data_frame), load_seconds=time.perf_counter() - started,
+                      memory_bytes=int(data_frame.memory_usage(deep=True).sum()))
+    return data_frame, stats
+
+
+def open_cube(paths):
+    return _cube_from_tables(map_table(paths['cells']), map_table(paths['distinct']),
+                             map_table(paths['distributions']))
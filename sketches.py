@@ -0,0 +1,107 @@
+"""HyperLogLog sketches for approximate, mergeable distinct counts.
+
+A sketch keeps 2**precision one-byte registers however many values are added.
+Two sketches of the same precision merge by taking the register-wise maximum,
+so partial sketches from chunks, shards or appended batches combine in constant
+memory. The relative standard error is about 1.04 / sqrt(2**precision).
+
+Sketches quack like the sets they replace in a SalesCube: `len()` is the
+estimate and `update()` merges another sketch in place.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+MIN_PRECISION = 4
+MAX_PRECISION = 18
+HASH_BITS = 64
+
+
+def precision_for_error(relative_error):
+    """Return the smallest precision whose standard error is within `relative_error`."""
+    if not 0 < relative_error < 1:
+        raise ValueError(f"relative_error must be between 0 and 1, got {relative_error!r}")
+    precision = math.ceil(math.log2((1.04 / relative_error) ** 2))
+    return min(max(precision, MIN_PRECISION), MAX_PRECISION)
+
+
+def hash_values(values):
+    """Return 64-bit hashes of `values`; a categorical hashes like its plain values."""
+    return pd.util.hash_pandas_object(pd.Series(values, copy=False), index=False).to_numpy()
+
+
+def _leading_zeros(words):
+    # Vectorized count of the leading zero bits of uint64 words by binary search
+    words = words.copy()
+    zeros = np.zeros(len(words), dtype=np.uint8)
+    for shift in (32, 16, 8, 4, 2, 1):
+        short = words < np.uint64(1 << (HASH_BITS - shift))
+        zeros[short] += shift
+        words[short] <<= np.uint64(shift)
+    return zeros
+
+
+def _alpha(registers):
+    if registers >= 128:
+        return 0.7213 / (1 + 1.079 / registers)
+    return {16: 0.673, 32: 0.697, 64: 0.709}[registers]
+
+
+class HyperLogLog:
+    def __init__(self, precision=14, registers=None):
+        if not MIN_PRECISION <= precision <= MAX_PRECISION:
+            raise ValueError(f"precision must be between {MIN_PRECISION} and {MAX_PRECISION}, got {precision!r}")
+        self.precision = precision
+        if registers is None:
+            registers = np.zeros(1 << precision, dtype=np.uint8)
+        self.registers = registers
+
+    @property
+    def standard_error(self):
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def add_hashes(self, hashes):
+        if not len(hashes):
+            return
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        buckets = (hashes >> np.uint64(HASH_BITS - self.precision)).astype(np.intp)
+        remaining = hashes << np.uint64(self.precision)
+        # Rank of the first set bit in the remaining bits, capped when they are all zero
+        ranks = np.minimum(_leading_zeros(remaining) + 1, HASH_BITS - self.precision + 1).astype(np.uint8)
+        np.maximum.at(self.registers, buckets, ranks)
+
+    def add(self, values):
+        self.add_hashes(hash_values(values))
+
+    def update(self, other):
+        """Merge `other` into this sketch, like set.update()."""
+        if other.precision != self.precision:
+            raise ValueError(f"Cannot merge sketches of precision {self.precision} and {other.precision}")
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def copy(self):
+        return HyperLogLog(self.precision, self.registers.copy())
+
+    def estimate(self):
+        registers = len(self.registers)
+        raw = _alpha(registers) * registers ** 2 / np.ldexp(1.0, -self.registers.astype(np.int32)).sum()
+        empty = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * registers and empty:
+            # Linear counting is more accurate while many registers are still empty
+            return registers * math.log(registers / empty)
+        return float(raw)
+
+    def __len__(self):
+        return int(round(self.estimate()))
+
+    def to_bytes(self):
+        return bytes([self.precision]) + self.registers.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data):
+        precision = data[0]
+        registers = np.frombuffer(data, dtype=np.uint8, offset=1).copy()
+        if len(registers) != 1 << precision:
+            raise ValueError("Truncated HyperLogLog sketch")
+        return cls(precision, registers)
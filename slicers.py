@@ -0,0 +1,118 @@
+"""Cross-filter slicers backed by per-value bitmap indexes.
+
+At load time every slicer column gets one packed bitmap per distinct value.
+A slicer combination resolves by OR-ing the bitmaps of the selected values of
+each column and AND-ing the columns together, which touches one bit per row.
+
+The sums and counts of a sliced cube come from filtering the cube cells, since
+every slicer column is a cube dimension. The distinct item and outlet counts are
+rebuilt from the identifier codes of the selected rows, and the distributions,
+which cost more, only when the caller passes the rows to sketch.
+"""
+import numpy as np
+import pandas as pd
+
+from aggregates import SalesCube
+from distributions import segment_distributions
+
+SLICER_COLUMNS = [
+    'Outlet Location Type',
+    'Outlet Size',
+    'Outlet Type',
+    'Item Fat Content',
+    'Item Type',
+    'Outlet Establishment Year',
+]
+
+# Above this many (outlet, item) pairs a slice's distinct pairs are found by sorting
+# instead of a presence array
+MAX_PRESENCE_SLOTS = 2 ** 26
+
+
+class SlicerIndex:
+    def __init__(self, data_frame):
+        self.row_count = len(data_frame)
+        self.values = {}
+        self.bitmaps = {}
+        for column in SLICER_COLUMNS:
+            codes, values = pd.factorize(data_frame[column], sort=True)
+            self.values[column] = values.tolist()
+            self.bitmaps[column] = {value: np.packbits(codes == code) for code, value in enumerate(values)}
+
+        item_codes, self.item_ids = pd.factorize(data_frame['Item Identifier'])
+        outlet_codes, self.outlet_ids = pd.factorize(data_frame['Outlet Identifier'])
+        outlet_type_codes, self.outlet_types = pd.factorize(data_frame['Outlet Type'])
+
+        # Every row gets one narrow code for its (outlet, outlet type, item) triple, so
+        # the distinct counts of a slice need a single gather over the selected rows
+        slot_codes, slots = pd.factorize(outlet_codes.astype(np.int64) * len(self.outlet_types) + outlet_type_codes)
+        self.slot_outlets = slots // len(self.outlet_types)
+        self.slot_outlet_types = slots % len(self.outlet_types)
+        self.pair_space = len(slots) * len(self.item_ids)
+        self.item_pair_codes = (slot_codes.astype(np.int64) * len(self.item_ids) + item_codes).astype(
+            np.min_scalar_type(max(self.pair_space - 1, 0)))
+
+    def normalize(self, filters):
+        """Drop slicers that select nothing or everything, which do not filter."""
+        active = {}
+        for column, selected in filters.items():
+            selected = set(selected)
+            selected = [value for value in self.values[column] if value in selected]
+            if selected and len(selected) < len(self.values[column]):
+                active[column] = selected
+        return active
+
+    def select(self, filters):
+        """Return the packed bitmap of rows matching every slicer, or None for all rows."""
+        selected = None
+        for column, values in self.normalize(filters).items():
+            column_bits = np.zeros_like(self.bitmaps[column][values[0]])
+            for value in values:
+                np.bitwise_or(column_bits, self.bitmaps[column][value], out=column_bits)
+            selected = column_bits if selected is None else np.bitwise_and(selected, column_bits, out=selected)
+        return selected
+
+    def mask(self, filters):
+        """Return a boolean mask of the rows matching every slicer."""
+        selected = self.select(filters)
+        if selected is None:
+            return np.ones(self.row_count, dtype=bool)
+        return np.unpackbits(selected, count=self.row_count).view(bool)
+
+    def rows(self, filters):
+        """Return the positions of the rows matching every slicer."""
+        return np.flatnonzero(self.mask(filters))
+
+    def sliced_cube(self, cube, filters, data_frame=None):
+        """Return `cube` restricted to the rows matching every slicer.
+
+        The distributions of the slice are sketched from `data_frame` if given
+        and left empty otherwise.
+        """
+        filters = self.normalize(filters)
+        if not filters:
+            return cube
+
+        cell_mask = np.ones(len(cube.cells), dtype=bool)
+        for column, values in filters.items():
+            cell_mask &= cube.cells[column].isin(values).to_numpy()
+
+        mask = self.mask(filters)
+        pairs = np.compress(mask, self.item_pair_codes)
+        if self.pair_space <= MAX_PRESENCE_SLOTS:
+            present = np.zeros(self.pair_space, dtype=bool)
+            present[pairs] = True
+            pairs = np.flatnonzero(present)
+        else:
+            pairs = np.unique(pairs)
+        pair_slots = pairs // len(self.item_ids)
+        pair_items = pairs % len(self.item_ids)
+        pair_outlet_types = self.slot_outlet_types[pair_slots]
+
+        return SalesCube(
+            cells=cube.cells[cell_mask].reset_index(drop=True),
+            items_by_outlet_type={str(self.outlet_types[code]): set(self.item_ids[pair_items[pair_outlet_types == code]])
+                                  for code in np.unique(pair_outlet_types)},
+            outlet_ids=set(self.outlet_ids[np.unique(self.slot_outlets[pair_slots])]),
+            distributions=segment_distributions(data_frame, mask) if data_frame is not None else {},
+        )
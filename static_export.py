@@ -0,0 +1,331 @@
+"""Pre-rendered static snapshot of the Analysis dashboard.
+
+    python static_export.py --output snapshot/
+    python static_export.py --shard-dir shards/ --workers 8 --output snapshot/
+
+Writes index.html with every chart and Key Insights of the Overview, Fat Based
+and Outlet Based tabs, plotly.min.js beside it, and snapshot.json with every
+dashboard result, so read-only viewers can be served from a plain file server.
+The charts and the JSON snapshot are rendered on a process pool. manifest.json
+records a hash of the input data; while the data is unchanged, nothing is
+regenerated.
+"""
+import argparse
+import hashlib
+import html
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Bump when the export output changes, so existing snapshots are regenerated
+EXPORT_VERSION = 1
+
+MANIFEST_FILE = 'manifest.json'
+HTML_FILE = 'index.html'
+SNAPSHOT_FILE = 'snapshot.json'
+PLOTLY_JS_FILE = 'plotly.min.js'
+
+PLOTLY_CONFIG = {'displaylogo': False, 'responsive': True}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Export the Blinkit Analysis dashboard as static HTML and JSON.")
+    parser.add_argument('dataset', nargs='?', default='Blinkit_cleaned_dataset.csv',
+                        help="cleaned sales CSV or Parquet cache (default: %(default)s)")
+    parser.add_argument('--output', '-o', default='snapshot', help="output directory (default: %(default)s)")
+    parser.add_argument('--memory-cap-mb', type=float,
+                        help="aggregate the CSV in chunks that fit this memory cap")
+    parser.add_argument('--shard-dir', help="aggregate every CSV shard under this directory instead")
+    parser.add_argument('--workers', type=int, help="worker processes for --shard-dir (default: one per CPU)")
+    parser.add_argument('--distinct-error', type=float,
+                        help="approximate distinct item/outlet counts within this relative error (default: exact)")
+    parser.add_argument('--jobs', type=int, help="processes rendering the charts and JSON (default: one per CPU)")
+    parser.add_argument('--force', action='store_true', help="regenerate even if the data is unchanged")
+    return parser.parse_args(argv)
+
+
+def data_hash(paths, distinct_error=None):
+    """Hash the content of every input file and the options that change the numbers."""
+    from columnar import content_hash
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((EXPORT_VERSION, distinct_error)).encode())
+    for path in paths:
+        digest.update(content_hash(path).encode())
+    return digest.hexdigest()
+
+
+def read_manifest(output_dir):
+    try:
+        return json.loads((Path(output_dir) / MANIFEST_FILE).read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def is_current(output_dir, digest):
+    """True if `output_dir` holds a complete export of the data with hash `digest`."""
+    manifest = read_manifest(output_dir)
+    return (manifest is not None and manifest.get('data_hash') == digest
+            and all((Path(output_dir) / name).exists() for name in manifest.get('files', ())))
+
+
+def write_text(path, text):
+    # Readers of a served snapshot never see a half-written file
+    temporary_path = f'{path}.{os.getpid()}.tmp'
+    Path(temporary_path).write_text(text, encoding='utf-8')
+    os.replace(temporary_path, path)
+
+
+# Process pool tasks
+def render_figure(builder, args):
+    import plotly.io
+
+    return plotly.io.to_json(builder(*args), validate=False)
+
+
+def write_snapshot(dashboard, path, digest):
+    from engine import to_jsonable
+
+    write_text(path, json.dumps({'data_hash': digest, 'dashboard': to_jsonable(dashboard)}, indent=2))
+
+
+def write_plotly_js(path):
+    from plotly.offline import get_plotlyjs
+
+    write_text(path, get_plotlyjs())
+
+
+# Key Insights, as shown beside each chart in the live app
+def _money(value):
+    return f"${value:,.2f}"
+
+
+def _insights(dashboard, panel_name):
+    # Returns (tone, label, value) lines; tone is 'green', 'orange' or None
+    tab, panel_key = panel_name.split('.')
+    panel = dashboard[tab][panel_key]
+    if panel_key == 'item_type_sales':
+        highest, lowest = panel['highest'], panel['lowest']
+        return [
+            (None, f"Out of {panel['type_count']} Total Types", ''),
+            ('green', 'Highest Sales Type', highest['Item Type']),
+            ('green', 'Sales Amount', _money(highest['Sales'])),
+            ('green', 'Percentage of Total Sales', f"{highest['Percentage']:.2f}%"),
+            ('orange', 'Lowest Sales Type', lowest['Item Type']),
+            ('orange', 'Sales Amount', _money(lowest['Sales'])),
+            ('orange', 'Percentage of Total Sales', f"{lowest['Percentage']:.2f}%"),
+        ]
+    if panel_key == 'outlet_type_sales':
+        return [
+            (None, 'Total Sales', _money(panel['total'])),
+            ('green', 'Highest Sales Outlet Type', f"{panel['highest']['Outlet Type']} - {_money(panel['highest']['Sales'])}"),
+            ('orange', 'Lowest Sales Outlet Type', f"{panel['lowest']['Outlet Type']} - {_money(panel['lowest']['Sales'])}"),
+        ]
+    if panel_key == 'location_type_sales':
+        return [
+            ('green', 'Highest Sales Location', f"{panel['highest']['Outlet Location Type']} - {_money(panel['highest']['Sales'])}"),
+            ('orange', 'Lowest Sales Location', f"{panel['lowest']['Outlet Location Type']} - {_money(panel['lowest']['Sales'])}"),
+        ]
+    if panel_key == 'item_visibility':
+        return [
+            ('green', 'Highest Average Visibility Item Type',
+             f"{panel['highest']['Item Type']} - {panel['highest']['Item Visibility']:.2f}"),
+            ('orange', 'Lowest Average Visibility Item Type',
+             f"{panel['lowest']['Item Type']} - {panel['lowest']['Item Visibility']:.2f}"),
+        ]
+    if panel_key == 'fat_content_sales':
+        return [
+            (None, 'Total Sales by Fat Content', _money(panel['total'])),
+            ('green', 'Highest Fat Content Sales', f"{panel['highest']['Item Fat Content']} - {_money(panel['highest']['Sales'])}"),
+            ('orange', 'Lowest Fat Content Sales', f"{panel['lowest']['Item Fat Content']} - {_money(panel['lowest']['Sales'])}"),
+        ]
+    if panel_key == 'location_fat_sales':
+        return [
+            ('green', 'Highest Outlet Sales for Fat Content',
+             f"{panel['highest']['Outlet Location Type']} - {_money(panel['highest']['Sales'])}"),
+            ('orange', 'Lowest Outlet Sales for Fat Content',
+             f"{panel['lowest']['Outlet Location Type']} - {_money(panel['lowest']['Sales'])}"),
+        ]
+    if panel_key == 'sales_by_year':
+        return [
+            (None, 'Total Sales', _money(panel['total'])),
+            ('orange', 'Sales in Latest Year', _money(panel['latest'])),
+            ('green', 'Growth Rate', f"{panel['growth_rate']:.2f}%"),
+        ]
+    if panel_key == 'outlet_location_sales':
+        return [
+            ('green', 'Highest Sales Outlet Type', f"{panel['highest']['Outlet Location Type']} - {_money(panel['highest']['Sales'])}"),
+            ('orange', 'Lowest Sales Outlet Type', f"{panel['lowest']['Outlet Location Type']} - {_money(panel['lowest']['Sales'])}"),
+        ]
+    if panel_key == 'outlet_size_sales':
+        return [
+            (None, 'Sales by High Outlets', _money(panel['high'])),
+            (None, 'Sales by Small Outlets', _money(panel['small'])),
+            (None, 'Sales by Medium Outlets', _money(panel['medium'])),
+        ]
+    return []
+
+
+# HTML
+PAGE_STYLE = """
+body { font-family: "Source Sans Pro", sans-serif; margin: 0 auto; max-width: 1200px; padding: 1rem 2rem; }
+h1 span { color: #09AB3B; }
+nav a { margin-right: 1.5rem; font-weight: bold; }
+.panel { display: flex; gap: 2rem; align-items: center; border-bottom: 1px solid #ddd; padding: 1rem 0; }
+.chart { flex: 2; min-height: 450px; }
+.insights { flex: 1; }
+.insights h3 { color: #1C83E1; }
+.green { color: #09AB3B; }
+.orange { color: #FF8700; }
+.metrics { display: flex; gap: 2rem; padding: 1rem 0; border-bottom: 1px solid #ddd; }
+.metric div:first-child { color: #1C83E1; }
+.metric div:last-child { font-size: 2rem; }
+table { border-collapse: collapse; }
+th, td { border: 1px solid #ddd; padding: 0.3rem 0.8rem; text-align: right; }
+"""
+
+
+def _insights_html(lines):
+    items = []
+    for tone, label, value in lines:
+        css_class = f' class="{tone}"' if tone else ''
+        separator = ':' if value != '' else ''
+        items.append(f"<p><strong{css_class}>{html.escape(label)}{separator}</strong> {html.escape(str(value))}</p>")
+    if not items:
+        return ''
+    return '<div class="insights"><h3>Key Insights</h3>' + ''.join(items) + '</div>'
+
+
+def _key_metrics_html(key_metrics):
+    metrics = [
+        ('Total Sales', _money(key_metrics['total_sales'])),
+        ('Avg Sales', _money(key_metrics['average_sales'])),
+        ('Average Rating', f"{key_metrics['average_rating']:.1f}"),
+        ('Number of Items', f"{key_metrics['unique_items']}"),
+        ('Total Outlets', f"{key_metrics['unique_outlets']}"),
+    ]
+    return '<div class="metrics">' + ''.join(
+        f'<div class="metric"><div>{label}</div><div>{html.escape(value)}</div></div>' for label, value in metrics) + '</div>'
+
+
+def _outlet_metrics_html(data):
+    formatters = {
+        'Total Sales': _money,
+        'Avg Sales': _money,
+        'Avg Rating': '{:.2f}'.format,
+        'Avg Item Visibility': '{:.2f}'.format,
+    }
+    return '<h2>Outlet Type Metrics Table</h2>' + data.to_html(index=False, formatters=formatters, border=0)
+
+
+def render_html(dashboard, figure_payloads, digest, rows, generated_at):
+    """Lay out the Overview, Fat Based and Outlet Based tabs as one static page."""
+    from panels import FAT_METRICS, fat_tab_key
+
+    chart_ids = {name: f'chart-{position}' for position, name in enumerate(figure_payloads)}
+
+    def panel_html(name):
+        return (f'<div class="panel"><div class="chart" id="{chart_ids[name]}"></div>'
+                f'{_insights_html(_insights(dashboard, name))}</div>')
+
+    sections = ['<section id="overview"><h2>Overview</h2>', _key_metrics_html(dashboard['overview']['key_metrics'])]
+    sections += [panel_html(name) for name in chart_ids if name.startswith('overview.')]
+    sections.append('</section><section id="fat"><h2>Fat Based Analysis</h2>')
+    for metric_label in FAT_METRICS:
+        sections.append(f'<h3>{html.escape(metric_label)}</h3>')
+        sections += [panel_html(name) for name in chart_ids
+                     if name.startswith(fat_tab_key(metric_label) + '.')]
+    sections.append('</section><section id="outlet"><h2>Outlet-Based Analysis</h2>')
+    sections += [panel_html(name) for name in chart_ids if name.startswith('outlet.')]
+    sections.append(_outlet_metrics_html(dashboard['outlet']['outlet_metrics']['data']))
+    sections.append('</section>')
+
+    # A literal "</" would end the script element early
+    figures = '{' + ','.join(f'"{chart_ids[name]}":{payload}' for name, payload in figure_payloads.items()) + '}'
+    figures = figures.replace('</', '<\\/')
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Blinkit Sales Analysis</title>
+<style>{PAGE_STYLE}</style>
+<script src="{PLOTLY_JS_FILE}"></script>
+</head>
+<body>
+<h1><span>Blinkit</span> Sales Analysis</h1>
+<p>Snapshot of {rows:,} rows generated {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(generated_at))} ·
+data hash {digest} · <a href="{SNAPSHOT_FILE}">JSON data</a></p>
+<nav><a href="#overview">Overview</a><a href="#fat">Fat Based Analysis</a><a href="#outlet">Outlet Based Analysis</a></nav>
+{''.join(sections)}
+<script>
+const figures = {figures};
+for (const [id, figure] of Object.entries(figures)) {{
+  Plotly.newPlot(id, figure.data, figure.layout, {json.dumps(PLOTLY_CONFIG)});
+}}
+</script>
+</body>
+</html>
+"""
+
+
+def export(cube, output_dir, digest, jobs=None):
+    """Render the static page, the JSON snapshot and plotly.js in parallel; return the written files."""
+    from charts import dashboard_figure_specs
+    from engine import compute_dashboard
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    dashboard = compute_dashboard(cube)
+    static_tabs = ('overview.', 'fat_', 'outlet.')
+    specs = [spec for spec in dashboard_figure_specs(dashboard) if spec[0].startswith(static_tabs)]
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        snapshot = executor.submit(write_snapshot, dashboard, output_dir / SNAPSHOT_FILE, digest)
+        plotly_js = executor.submit(write_plotly_js, output_dir / PLOTLY_JS_FILE)
+        figures = {name: executor.submit(render_figure, builder, args) for name, builder, args in specs}
+        figure_payloads = {name: future.result() for name, future in figures.items()}
+        generated_at = time.time()
+        write_text(output_dir / HTML_FILE, render_html(dashboard, figure_payloads, digest, cube.row_count, generated_at))
+        snapshot.result()
+        plotly_js.result()
+
+    files = [HTML_FILE, PLOTLY_JS_FILE, SNAPSHOT_FILE]
+    # Written last, so an interrupted export is redone on the next run
+    write_text(output_dir / MANIFEST_FILE, json.dumps({
+        'data_hash': digest,
+        'generated_at': generated_at,
+        'rows': cube.row_count,
+        'files': files,
+    }, indent=2))
+    return [output_dir / name for name in files + [MANIFEST_FILE]]
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    started = time.perf_counter()
+
+    from parallel import discover_shards
+
+    input_paths = discover_shards(args.shard_dir) if args.shard_dir else [args.dataset]
+    digest = data_hash(input_paths, args.distinct_error)
+    if not args.force and is_current(args.output, digest):
+        print(f"{args.output} is up to date (data hash {digest})", file=sys.stderr)
+        return 0
+
+    from engine import load_cube
+
+    cube = load_cube(args.dataset, memory_cap_mb=args.memory_cap_mb,
+                     shard_dir=args.shard_dir, workers=args.workers, distinct_error=args.distinct_error)
+    written = export(cube, args.output, digest, jobs=args.jobs)
+    for path in written:
+        print(path, file=sys.stderr)
+    print(f"{cube.row_count:,} rows exported in {time.perf_counter() - started:.3f}s (data hash {digest})",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
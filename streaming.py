@@ -0,0 +1,62 @@
+"""Out-of-core aggregation for sales files that do not fit in memory.
+
+The CSV (or Parquet cache) is read in bounded chunks and each chunk is folded into a running
+SalesCube, so peak memory depends on the chunk size rather than the file size.
+"""
+import pandas as pd
+
+from aggregates import build_cube, merge_cubes
+from data_loader import DATASET_DTYPES
+
+DEFAULT_MEMORY_CAP_MB = 256
+
+# Parsing a chunk briefly needs a few times the memory of the parsed frame
+PARSE_OVERHEAD = 4
+SAMPLE_ROWS = 1000
+
+
+def _is_parquet(path):
+    return str(path).endswith('.parquet')
+
+
+def _parquet_batches(path, batch_rows):
+    import pyarrow.parquet
+
+    for batch in pyarrow.parquet.ParquetFile(path).iter_batches(batch_size=batch_rows):
+        yield batch.to_pandas()
+
+
+def chunk_rows_for_cap(path, memory_cap_mb=DEFAULT_MEMORY_CAP_MB):
+    """Estimate how many rows per chunk keep parsing within `memory_cap_mb`."""
+    if _is_parquet(path):
+        sample = next(_parquet_batches(path, SAMPLE_ROWS), pd.DataFrame())
+    else:
+        sample = pd.read_csv(path, index_col=0, dtype=DATASET_DTYPES, nrows=SAMPLE_ROWS)
+    if sample.empty:
+        return SAMPLE_ROWS
+    bytes_per_row = sample.memory_usage(deep=True).sum() / len(sample)
+    return max(SAMPLE_ROWS, int(memory_cap_mb * 1024 ** 2 / (bytes_per_row * PARSE_OVERHEAD)))
+
+
+def iter_chunks(path, chunk_rows):
+    if _is_parquet(path):
+        yield from _parquet_batches(path, chunk_rows)
+        return
+    with pd.read_csv(path, index_col=0, dtype=DATASET_DTYPES, chunksize=chunk_rows) as reader:
+        yield from reader
+
+
+def fold_cubes(cubes):
+    """Merge a stream of partial cubes without holding more than two at a time."""
+    total = None
+    for cube in cubes:
+        total = cube if total is None else merge_cubes([total, cube])
+    if total is None:
+        raise ValueError("No rows to aggregate")
+    return total
+
+
+def stream_cube(path, memory_cap_mb=DEFAULT_MEMORY_CAP_MB, chunk_rows=None, distinct_error=None):
+    """Build the SalesCube for `path` chunk by chunk."""
+    chunk_rows = chunk_rows or chunk_rows_for_cap(path, memory_cap_mb)
+    return fold_cubes(build_cube(chunk, distinct_error) for chunk in iter_chunks(path, chunk_rows))
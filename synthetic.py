@@ -0,0 +1,146 @@
+"""Synthetic sales data with the schema and cardinalities of Blinkit_cleaned_dataset.csv.
+
+    python synthetic.py --rows 1000000 --output synthetic_1m.csv
+
+As in the real data, every item keeps one Item Type and fat content, and every
+outlet keeps one establishment year, location and type. Item Types are drawn
+as often as in the real data, and hard drinks and non-food types are always
+Low Fat. Most outlets keep one size, but OUT010, OUT017 and OUT045 appear under
+all three, so their size is drawn per row from their real mix. Rows are generated and written in chunks,
+so any row count fits in memory.
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+# Item Type -> distinct items of that type in the bundled dataset
+ITEM_TYPE_ITEMS = {
+    'Baking Goods': 119, 'Breads': 45, 'Breakfast': 20, 'Canned': 120, 'Dairy': 125,
+    'Frozen Foods': 155, 'Fruits and Vegetables': 220, 'Hard Drinks': 40,
+    'Health and Hygiene': 95, 'Household': 170, 'Meat': 80, 'Others': 30, 'Seafood': 10,
+    'Snack Foods': 220, 'Soft Drinks': 80, 'Starchy Foods': 30,
+}
+ITEM_TYPES = list(ITEM_TYPE_ITEMS)
+# Item Types that are only ever Low Fat in the bundled dataset
+LOW_FAT_ONLY_TYPES = ['Hard Drinks', 'Health and Hygiene', 'Household', 'Others']
+FAT_CONTENTS = ['Low Fat', 'Regular']
+# Share of the other items per fat content
+FAT_CONTENT_WEIGHTS = [0.55, 0.45]
+
+# The ten outlets of the bundled dataset; a size of None is drawn per row from OUTLET_SIZE_MIX
+OUTLETS = [
+    ('OUT010', 2011, 'Tier 3', None, 'Grocery Store'),
+    ('OUT013', 2014, 'Tier 3', 'High', 'Supermarket Type1'),
+    ('OUT017', 2020, 'Tier 2', None, 'Supermarket Type1'),
+    ('OUT018', 2022, 'Tier 3', 'Medium', 'Supermarket Type2'),
+    ('OUT019', 2018, 'Tier 1', 'Small', 'Grocery Store'),
+    ('OUT027', 2018, 'Tier 3', 'Medium', 'Supermarket Type3'),
+    ('OUT035', 2017, 'Tier 2', 'Small', 'Supermarket Type1'),
+    ('OUT045', 2015, 'Tier 2', None, 'Supermarket Type1'),
+    ('OUT046', 2016, 'Tier 1', 'Small', 'Supermarket Type1'),
+    ('OUT049', 2012, 'Tier 1', 'Medium', 'Supermarket Type1'),
+]
+OUTLET_SIZES = ['High', 'Medium', 'Small']
+# Rows per OUTLET_SIZES value of the outlets that appear under several sizes in the bundled dataset
+OUTLET_SIZE_MIX = {
+    'OUT010': (233, 265, 57),
+    'OUT017': (314, 244, 368),
+    'OUT045': (274, 329, 326),
+}
+OUTLET_COLUMNS = ['Outlet Identifier', 'Outlet Establishment Year', 'Outlet Location Type',
+                  'Outlet Size', 'Outlet Type']
+
+COLUMNS = [
+    'Item Fat Content', 'Item Identifier', 'Item Type', 'Outlet Establishment Year',
+    'Outlet Identifier', 'Outlet Location Type', 'Outlet Size', 'Outlet Type',
+    'Item Visibility', 'Item Weight', 'Sales', 'Rating',
+]
+
+DEFAULT_ITEMS = 1559
+DEFAULT_CHUNK_ROWS = 1_000_000
+MISSING_WEIGHT_RATE = 0.17
+
+
+def _item_prefix(item_type):
+    if item_type in ('Hard Drinks', 'Soft Drinks'):
+        return 'DR'
+    if item_type in ('Health and Hygiene', 'Household', 'Others'):
+        return 'NC'
+    return 'FD'
+
+
+def make_items(n_items, rng):
+    type_weights = np.array(list(ITEM_TYPE_ITEMS.values()), dtype='float64')
+    item_types = rng.choice(ITEM_TYPES, size=n_items, p=type_weights / type_weights.sum())
+    fat_contents = rng.choice(FAT_CONTENTS, size=n_items, p=FAT_CONTENT_WEIGHTS)
+    fat_contents[np.isin(item_types, LOW_FAT_ONLY_TYPES)] = 'Low Fat'
+    return pd.DataFrame({
+        'Item Identifier': [f"{_item_prefix(item_type)}{chr(65 + i % 26)}{i // 26:02d}"
+                            for i, item_type in enumerate(item_types)],
+        'Item Type': item_types,
+        'Item Fat Content': fat_contents,
+        'Item Weight': rng.uniform(4.555, 21.35, size=n_items).round(3),
+    })
+
+
+def make_outlets(n_outlets, rng):
+    outlets = pd.DataFrame(OUTLETS[:n_outlets], columns=OUTLET_COLUMNS)
+    # Sampled extra outlets keep the size mix of the outlet they copy
+    outlets['Outlet Size Mix'] = outlets['Outlet Identifier'].map(OUTLET_SIZE_MIX)
+    extra = n_outlets - len(outlets)
+    if extra > 0:
+        template = pd.DataFrame(OUTLETS, columns=OUTLET_COLUMNS)
+        template['Outlet Size Mix'] = template['Outlet Identifier'].map(OUTLET_SIZE_MIX)
+        sampled = template.iloc[rng.integers(len(template), size=extra)].reset_index(drop=True)
+        sampled['Outlet Identifier'] = [f"OUT{100 + i:03d}" for i in range(extra)]
+        outlets = pd.concat([outlets, sampled], ignore_index=True)
+    return outlets
+
+
+def generate_chunk(rows, items, outlets, rng):
+    item_rows = items.iloc[rng.integers(len(items), size=rows)].reset_index(drop=True)
+    outlet_codes = rng.integers(len(outlets), size=rows)
+    outlet_rows = outlets.iloc[outlet_codes].reset_index(drop=True)
+    chunk = pd.concat([item_rows, outlet_rows], axis=1)
+    sizes = chunk['Outlet Size'].to_numpy(dtype=object)
+    for outlet, mix in outlets['Outlet Size Mix'].dropna().items():
+        picked = outlet_codes == outlet
+        sizes[picked] = rng.choice(OUTLET_SIZES, size=picked.sum(), p=np.divide(mix, sum(mix)))
+    chunk['Outlet Size'] = sizes
+    chunk.loc[rng.random(rows) < MISSING_WEIGHT_RATE, 'Item Weight'] = np.nan
+    chunk['Item Visibility'] = rng.gamma(1.6, 0.041, size=rows).clip(0, 0.33).round(9)
+    chunk['Sales'] = rng.uniform(31.29, 266.89, size=rows).round(4)
+    chunk['Rating'] = rng.normal(4.0, 0.6, size=rows).clip(1, 5).round(1)
+    return chunk[COLUMNS]
+
+
+def write_dataset(path, rows, n_items=DEFAULT_ITEMS, n_outlets=len(OUTLETS), seed=0,
+                  chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Write `rows` synthetic rows to a CSV laid out like the cleaned dataset."""
+    rng = np.random.default_rng(seed)
+    items = make_items(n_items, rng)
+    outlets = make_outlets(n_outlets, rng)
+    written = 0
+    while True:
+        chunk = generate_chunk(min(chunk_rows, rows - written), items, outlets, rng)
+        chunk.index = pd.RangeIndex(written, written + len(chunk))
+        chunk.to_csv(path, mode='w' if written == 0 else 'a', header=written == 0)
+        written += len(chunk)
+        if written >= rows:
+            return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate Blinkit-shaped synthetic sales data.")
+    parser.add_argument('--rows', type=int, required=True)
+    parser.add_argument('--output', '-o', required=True)
+    parser.add_argument('--items', type=int, default=DEFAULT_ITEMS, help="distinct items (default: %(default)s)")
+    parser.add_argument('--outlets', type=int, default=len(OUTLETS), help="distinct outlets (default: %(default)s)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    write_dataset(args.output, args.rows, n_items=args.items, n_outlets=args.outlets, seed=args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+import os
+
+import pytest
+
+import ingest
+from conftest import REPO_DIR
+from ingest import SalesIngestor
+
+with open(os.path.join(REPO_DIR, 'Blinkit_cleaned_dataset.csv')) as dataset:
+    LINES = dataset.read().splitlines(keepends=True)
+HEADER = LINES[0]
+
+
+def write(path, text, mode='w'):
+    with open(path, mode) as csv_file:
+        csv_file.write(text)
+
+
+@pytest.fixture
+def sources(tmp_path):
+    csv_path, drop_dir = tmp_path / 'sales.csv', tmp_path / 'drop'
+    drop_dir.mkdir()
+    write(csv_path, HEADER + ''.join(LINES[1:201]))
+    return csv_path, drop_dir
+
+
+def test_partial_line_waits_for_its_newline(sources):
+    csv_path, _ = sources
+    ingestor = SalesIngestor(csv_path)
+    assert ingestor.poll() == 200
+    write(csv_path, LINES[201][:10], 'a')
+    assert ingestor.poll() == 0
+    write(csv_path, LINES[201][10:] + LINES[202], 'a')
+    assert ingestor.poll() == 2
+    assert ingestor.cube.row_count == 202
+
+
+def test_replaced_file_is_read_from_the_top(sources, tmp_path):
+    csv_path, _ = sources
+    ingestor = SalesIngestor(csv_path)
+    ingestor.poll()
+    # A larger file under the same name, with the rows in another order
+    replacement = tmp_path / 'replacement.csv'
+    write(replacement, HEADER + ''.join(reversed(LINES[1:301])))
+    os.replace(replacement, csv_path)
+    assert ingestor.poll() == 300
+    assert ingestor.cube.row_count == ingestor.rows_ingested == 300
+
+
+def test_failed_batch_keeps_tail_rows_for_the_next_poll(sources, monkeypatch):
+    csv_path, drop_dir = sources
+    ingestor = SalesIngestor(csv_path, drop_dir)
+    ingestor.poll()
+    write(csv_path, ''.join(LINES[201:211]), 'a')
+    write(drop_dir / 'b1.csv', HEADER + ''.join(LINES[211:221]))
+
+    build_cube = ingest.build_cube
+    def failing_build_cube(*args):
+        raise MemoryError
+    monkeypatch.setattr(ingest, 'build_cube', failing_build_cube)
+    with pytest.raises(MemoryError):
+        ingestor.poll()
+    monkeypatch.setattr(ingest, 'build_cube', build_cube)
+
+    assert ingestor.poll() == 20
+    assert ingestor.cube.row_count == 220
+    assert ingestor.poll() == 0
+
+
+def test_malformed_batch_is_skipped_until_rewritten(sources):
+    csv_path, drop_dir = sources
+    ingestor = SalesIngestor(csv_path, drop_dir)
+    ingestor.poll()
+    write(csv_path, ''.join(LINES[201:211]), 'a')
+    write(drop_dir / 'b1.csv', "not,a,sales batch\n1,2\n")
+    assert ingestor.poll() == 10
+    assert ingestor.poll() == 0
+    write(drop_dir / 'b1.csv', HEADER + ''.join(LINES[211:221]))
+    assert ingestor.poll() == 10
+    assert ingestor.cube.row_count == 220
+
+
+def test_unparseable_tail_rows_are_skipped(sources):
+    csv_path, _ = sources
+    ingestor = SalesIngestor(csv_path)
+    ingestor.poll()
+    bad_number = LINES[201].rsplit(',', 1)[0] + ',not a rating\n'
+    extra_fields = LINES[202].rstrip('\n') + ',1,2\n'
+    write(csv_path, bad_number + extra_fields + LINES[203], 'a')
+    assert ingestor.poll() == 1
+    assert ingestor.rows_rejected == 2
+    write(csv_path, LINES[204], 'a')
+    assert ingestor.poll() == 1
+    assert ingestor.cube.row_count == 202
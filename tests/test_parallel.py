@@ -0,0 +1,44 @@
+import os
+
+import pytest
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from conftest import REPO_DIR
+from parallel import MIN_PARALLEL_BYTES, discover_shards, parallel_cube
+from synthetic import write_dataset
+
+SHARD_ROWS = 100_000
+
+
+@pytest.fixture(scope='module')
+def large_shard_dir(tmp_path_factory):
+    """Shards totalling more than MIN_PARALLEL_BYTES, so they go to the process pool."""
+    shard_dir = tmp_path_factory.mktemp('shards')
+    total_bytes, seed = 0, 0
+    while total_bytes <= MIN_PARALLEL_BYTES:
+        path = shard_dir / f'shard{seed}.csv'
+        write_dataset(path, SHARD_ROWS, seed=seed)
+        total_bytes += os.path.getsize(path)
+        seed += 1
+    return shard_dir
+
+
+def test_parallel_cube_matches_serial(large_shard_dir):
+    shard_paths = discover_shards(large_shard_dir)
+    serial = parallel_cube(shard_paths, workers=1)
+    parallel = parallel_cube(shard_paths, workers=2)
+    assert parallel.row_count == serial.row_count
+    assert parallel.cells['Sales'].sum() == pytest.approx(serial.cells['Sales'].sum())
+
+
+def test_app_renders_over_large_shards(large_shard_dir, monkeypatch):
+    monkeypatch.setenv('BLINKIT_SHARD_DIR', str(large_shard_dir))
+    monkeypatch.setenv('BLINKIT_WORKERS', '2')
+    monkeypatch.chdir(REPO_DIR)
+    st.cache_resource.clear()
+    app = AppTest.from_file(os.path.join(REPO_DIR, 'main.py'), default_timeout=300)
+    app.run()
+    assert not app.exception
+    assert not app.error, [error.value for error in app.error]
+    assert app.metric[0].value.startswith('$')
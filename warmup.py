@@ -0,0 +1,132 @@
+"""Background warm-up and stale-while-revalidate refresh of dashboard results.
+
+One worker thread per server process polls a cheap signature of the source data
+(file sizes and modification times). On the first poll, and whenever the
+signature changes, it loads the data and precomputes every panel, row index and
+chart into a new DashboardSnapshot, then swaps it in. Requests always read the
+latest complete snapshot, so they never wait for a refresh; a refresh that fails
+leaves the last good snapshot in place and is retried with an exponential backoff,
+or straight away if the data changes.
+"""
+import logging
+import threading
+import time
+from dataclasses import dataclass
+
+from charts import dashboard_figure_specs
+from drilldown import SORT_COLUMNS, DrillDownIndex
+from engine import compute_dashboard
+from profiling import Profiler, profiled
+from slicers import SlicerIndex
+
+logger = logging.getLogger('blinkit.warmup')
+
+DEFAULT_POLL_SECONDS = 5
+# A failed refresh is retried after DEFAULT_RETRY_SECONDS, doubling per failure up to MAX_RETRY_SECONDS
+DEFAULT_RETRY_SECONDS = 5
+MAX_RETRY_SECONDS = 300
+
+
+@dataclass(frozen=True)
+class DashboardSnapshot:
+    """Everything the dashboard serves for one version of the data."""
+    signature: object
+    as_of: float
+    cube: object
+    dashboard: dict
+    data_frame: object = None
+    load_stats: object = None
+    slicer_index: object = None
+    drilldown_index: object = None
+
+
+def warm_snapshot(signature, cube, data_frame=None, load_stats=None, run=None, figure_cache=None,
+                  panel_workers=None):
+    """Precompute every panel, and with row-level data the slicer and drill-down indexes.
+
+    `panel_workers` caps the threads computing the panels of a tab.
+    """
+    run = run or Profiler().new_run('refresh')
+    dashboard = compute_dashboard(cube, panel_workers,
+                                  wrap_panel=lambda name, panel: profiled(run, 'compute', name, panel))
+    slicer_index = drilldown_index = None
+    if data_frame is not None:
+        with run.stage('compute', 'indexes'):
+            slicer_index = SlicerIndex(data_frame)
+            drilldown_index = DrillDownIndex(data_frame)
+            for column in SORT_COLUMNS:
+                drilldown_index.order(column)
+    if figure_cache is not None:
+        for name, builder, args in dashboard_figure_specs(dashboard):
+            with run.stage('figure', name):
+                figure_cache.get_or_build(builder, *args)
+    return DashboardSnapshot(signature=signature, as_of=time.time(), cube=cube, dashboard=dashboard,
+                             data_frame=data_frame, load_stats=load_stats, slicer_index=slicer_index,
+                             drilldown_index=drilldown_index)
+
+
+class BackgroundRefresher:
+    """Keeps `snapshot` current by calling build(signature, run) off the request path."""
+
+    def __init__(self, signature, build, poll_seconds=DEFAULT_POLL_SECONDS, profiler=None,
+                 retry_seconds=DEFAULT_RETRY_SECONDS):
+        self.signature = signature
+        self.build = build
+        self.poll_seconds = poll_seconds
+        self.retry_seconds = retry_seconds
+        self.profiler = profiler or Profiler()
+        self.snapshot = None
+        self.refreshing = False
+        self.last_error = None
+        self.last_run = None
+        # Consecutive failures of the same version, which is not rebuilt before _retry_at
+        self.failures = 0
+        self._failed_signature = None
+        self._retry_at = 0.0
+        self._attempted = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='blinkit-refresh', daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while True:
+            self.refresh()
+            time.sleep(self.poll_seconds)
+
+    def refresh(self):
+        """Rebuild the snapshot if the data changed; returns True when a new one was swapped in."""
+        signature = None
+        try:
+            signature = self.signature()
+            if self.snapshot is not None and signature == self.snapshot.signature:
+                return False
+            if self.failures and signature == self._failed_signature and time.monotonic() < self._retry_at:
+                return False
+            self.refreshing = True
+            run = self.profiler.new_run('refresh')
+            snapshot = self.build(signature, run)
+        except Exception as error:
+            logger.exception("Dashboard refresh failed; serving the last good snapshot")
+            self.last_error = error
+            self.failures = self.failures + 1 if self.failures and signature == self._failed_signature else 1
+            self._failed_signature = signature
+            self._retry_at = time.monotonic() + min(self.retry_seconds * 2 ** (self.failures - 1), MAX_RETRY_SECONDS)
+            return False
+        else:
+            self.snapshot = snapshot
+            self.last_run = run
+            self.last_error = None
+            self.failures = 0
+            self._failed_signature = None
+            return True
+        finally:
+            self.refreshing = False
+            self._attempted.set()
+
+    def wait_ready(self, timeout=None):
+        """Block until the first refresh has been attempted; return the snapshot (None if it failed)."""
+        self._attempted.wait(timeout)
+        return self.snapshot